@@ -1,48 +1,80 @@
 import time
+import uuid
 import streamlit as st
-import pandas as pd
 from typing import List
 
+# --- Lazy imports / startup timing ---
+from modules.lazy import lazy_import, mark, preload, startup_report
+
 # --- CONFIG ---
 from config.roles import ROLE_SKILLS, DIFFICULTY_SETTINGS
+from config.runtime import PRELOAD_ENABLED, MCQ_PAGE_SIZE
 
 # --- Resume + ATS ---
-from modules.resume_parser import extract_text_from_pdf, extract_skills, load_spacy
-from modules.ats_scoring import get_ats_score, resume_suggestions
+from modules.resume_parser import iter_page_skills, extract_skills, load_spacy
+from modules.ats_scoring import get_ats_score, resume_suggestions, top_roles
 
 # --- Question Generators ---
 from modules.question_generator import (
     simple_hr_questions, simple_tech_questions,
     ai_hr_questions, ai_tech_questions
 )
-from modules.answers import generate_answer
+from modules.answers import stream_answer
 
 # --- MCQs ---
 from modules.mcq_generator import generate_mcqs
 from modules.mcq_ai_generator import generate_ai_mcqs
-from modules.scoring import MCQ_DIFFICULTY_WEIGHTS
+from modules.scoring import MCQ_DIFFICULTY_WEIGHTS, grade_mcqs
 
 # --- Practice Mode ---
 from modules.timer import init_practice_state, render_practice_block
 
 # --- Export ---
+from modules import pdf_export
 from modules.pdf_export import export_pdf_bytes
 
+# --- Analytics ---
+from modules.attempt_log import get_attempt_log, record_attempts
+
+# --- Background pre-generation ---
+from modules.pregen import get_pools
+from modules.mcq_corpus import get_mcq_corpus
+
 # --- Dedup ---
 from modules.dedup import deduplicate_text_list, deduplicate_mcq_list
 
 # --- Job Description Analyzer ---
 from modules.jd_analyzer import (
     extract_jd_text, extract_jd_skills,
-    compare_resume_vs_jd, jd_summary
+    compare_resume_vs_jd, jd_summary, stream_jd_summary, parse_jd_summary,
+    chunk_jd_text, must_have_skills
 )
 
+# --- JD index ---
+from modules.jd_index import get_jd_index
+
 # --- Voice Interview ---
+from modules import voice_interview
 from modules.voice_interview import render_voice_interview
-
-
-# ✅ Load spaCy once
-_ = load_spacy()
+from modules.llm import llm_available
+
+pd = lazy_import("pandas")
+mark("imports_done")
+
+
+@st.cache_resource(show_spinner=False)
+def start_background_preload():
+    """
+    Runs once per process after the first page paint: warms heavy
+    dependencies so the first click on a feature doesn't pay for them.
+    """
+    get_pools()  # ✅ background question/MCQ pool filler
+    get_mcq_corpus()  # ✅ memory-map the offline MCQ corpus, if built
+    if not PRELOAD_ENABLED:
+        return None
+    return preload([
+        load_spacy, pd, pdf_export.platypus, voice_interview.sr, voice_interview.audiorec, llm_available,
+    ])
 
 
 # -----------------------------------------------------------------------------
@@ -65,10 +97,14 @@ def init_state():
 
     ss.setdefault("mcqs", [])
     ss.setdefault("mcq_score", 0)
+    ss.setdefault("mcq_graded", {})  # question index -> analytics row of its last check
     ss.setdefault("use_ai", True)
 
     ss.setdefault("analytics", {"mcq_rows": []})
 
+    # Anonymous per-session id: the question bank skips MCQs already served to it
+    ss.setdefault("user_id", uuid.uuid4().hex)
+
     # Voice interview
     ss.setdefault("vi_question", "")
     ss.setdefault("vi_last_feedback", {})
@@ -89,6 +125,307 @@ def difficulty_badge(d: str) -> str:
     return "⬜ Unknown"
 
 
+# -----------------------------------------------------------------------------
+# ✅ TAB 1 — ATS + Resume Suggestions
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_ats_tab(ss):
+    st.subheader("✅ ATS Skill Matcher")
+
+    score, matched, missing = ss.ats
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("ATS Score", f"{score}%")
+    c2.metric("Matched Skills", len(matched))
+    c3.metric("Missing Skills", len(missing))
+
+    st.write("✅ **Matched:**", matched or "-")
+    st.write("❌ **Missing:**", missing or "-")
+
+    if ss.skills:
+        st.markdown("#### 🎯 Best-fit roles")
+        st.table([
+            {"Role": r, "ATS Score": f"{s}%", "Missing": ", ".join(miss) or "-"}
+            for r, s, _, miss in top_roles(ss.skills, k=3)
+        ])
+
+    if st.button("Generate Resume Suggestions"):
+        ss.suggestions = resume_suggestions(ss.skills, missing, ss.role)
+
+    if ss.suggestions:
+        st.success("\n".join([f"• {s}" for s in ss.suggestions]))
+
+
+# -----------------------------------------------------------------------------
+# ✅ TAB 2 — HR + Technical Questions
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_questions_tab(ss):
+    st.subheader("🎤 HR & Technical Question Generator")
+
+    n_q = st.slider("How many questions?", 3, 20, 8)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("Generate HR Questions"):
+            qs = ai_hr_questions(ss.role, ss.level, n_q) if ss.use_ai else simple_hr_questions(ss.role, ss.level, n_q)
+            ss.hr_questions = deduplicate_text_list(qs)
+
+    with col2:
+        if st.button("Generate Technical Questions"):
+            qs = ai_tech_questions(ss.role, ss.level, n_q, ss.skills) if ss.use_ai else simple_tech_questions(ss.role, ss.level, ss.skills, n_q)
+            ss.tech_questions = deduplicate_text_list(qs)
+
+    # Display HR
+    if ss.hr_questions:
+        st.markdown("### 👥 HR Questions")
+        for i, q in enumerate(ss.hr_questions, start=1):
+            with st.expander(f"{i}. {q}"):
+                if st.button(f"Answer HR {i}"):
+                    ans = st.write_stream(stream_answer(q, ss.role, ss.level))
+                    if len(ss.answers) < i:
+                        ss.answers += [""] * (i - len(ss.answers))
+                    ss.answers[i - 1] = ans.strip()
+                else:
+                    st.write(ss.answers[i - 1] if len(ss.answers) >= i else "")
+
+    # Display Technical
+    if ss.tech_questions:
+        st.markdown("### 💻 Technical Questions")
+        base = len(ss.hr_questions)
+        for i, q in enumerate(ss.tech_questions, start=1):
+            idx = base + i
+            with st.expander(f"{i}. {q}"):
+                if st.button(f"Answer Tech {i}"):
+                    ans = st.write_stream(stream_answer(q, ss.role, ss.level))
+                    if len(ss.answers) < idx:
+                        ss.answers += [""] * (idx - len(ss.answers))
+                    ss.answers[idx - 1] = ans.strip()
+                else:
+                    st.write(ss.answers[idx - 1] if len(ss.answers) >= idx else "")
+
+
+def check_mcq_page(ss, lo: int, page_mcqs: List[dict]):
+    """Grade every answered question of one MCQ page and write its analytics rows in one go."""
+    # Questions left without a choice are not graded
+    answered = [
+        (i, m, ss.get(f"mcq_{i}")) for i, m in enumerate(page_mcqs, start=lo) if ss.get(f"mcq_{i}") in m["options"]
+    ]
+    if not answered:
+        return
+    is_correct, points = grade_mcqs(
+        [m["options"].index(c) for _, m, c in answered],
+        [m["answer_index"] for _, m, _ in answered],
+    )
+    # Only a question's first check is logged; re-checks would count it twice in the analytics
+    first = [i not in ss.mcq_graded for i, _, _ in answered]
+    for (i, m, c), ok, pts in zip(answered, is_correct, points):
+        ss.mcq_graded[i] = {
+            "q#": i + 1, "difficulty": m.get("difficulty", ""),
+            "selected": c, "correct": m["options"][m["answer_index"]],
+            "is_correct": bool(ok), "score": int(pts)
+        }
+    # Re-checking a question replaces its row instead of adding another
+    ss.analytics["mcq_rows"] = [ss.mcq_graded[i] for i in sorted(ss.mcq_graded)]
+    ss.mcq_score = sum(r["score"] for r in ss.analytics["mcq_rows"])
+    record_attempts(ss.user_id, "check", [
+        {"id": m.get("id"), "skill": m.get("skill"), "difficulty": m.get("difficulty"),
+         "is_correct": ok, "score": pts}
+        for (_, m, _), ok, pts, new in zip(answered, is_correct, points, first) if new
+    ], level=ss.level)
+
+
+# -----------------------------------------------------------------------------
+# ✅ TAB 3 — MCQ Generator
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_mcq_tab(ss):
+    st.subheader("📝 MCQ Generator + Checking")
+    n_mcq = st.slider("MCQs count", 5, 60, 12)
+
+    if st.button("Generate MCQs"):
+        ss.mcqs = generate_ai_mcqs(ss.role, ss.skills, n_mcq, ss.level, user=ss.user_id) if ss.use_ai else generate_mcqs(ss.role, ss.skills, n_mcq, ss.level, user=ss.user_id)
+        ss.mcqs = deduplicate_mcq_list(ss.mcqs)
+        ss.mcq_score = 0
+        ss.mcq_graded = {}
+        ss.analytics["mcq_rows"] = []
+
+    if ss.mcqs:
+        n_pages = -(-len(ss.mcqs) // MCQ_PAGE_SIZE)
+        if ss.get("mcq_page", 1) > n_pages:
+            ss.mcq_page = 1
+        page = st.number_input("Page", 1, n_pages, key="mcq_page", help=f"{MCQ_PAGE_SIZE} questions per page")
+        lo = (page - 1) * MCQ_PAGE_SIZE
+        page_mcqs = ss.mcqs[lo:lo + MCQ_PAGE_SIZE]
+
+        # ✅ Only this page is rendered, and one submit checks all of it
+        with st.form(f"mcq_page_{page}"):
+            for i, m in enumerate(page_mcqs, start=lo):
+                st.markdown(f"### Q{i+1}: {m['question']}")
+                st.caption(difficulty_badge(m.get("difficulty", "")))
+
+                row = ss.mcq_graded.get(i)
+                prev = m["options"].index(row["selected"]) if row and row["selected"] in m["options"] else None
+                st.radio("Choose:", m["options"], index=prev, key=f"mcq_{i}")
+
+                if row and row["is_correct"]:
+                    st.success(f"✅ Correct! {m['explanation']}")
+                elif row:
+                    st.error(f"❌ Wrong. Correct: {row['correct']}")
+
+            st.form_submit_button(f"Check page {page}", on_click=check_mcq_page, args=(ss, lo, page_mcqs))
+
+    if ss.mcqs:
+        st.info(f"Score: {ss.mcq_score} / {len(ss.mcqs) * 5}")
+
+
+# -----------------------------------------------------------------------------
+# ✅ TAB 4 — Timed Practice Mode
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_practice_tab(ss):
+    from modules.scoring import score_mcq
+    render_practice_block(ss, DIFFICULTY_SETTINGS, score_mcq, use_ai=ss.use_ai)
+
+
+# -----------------------------------------------------------------------------
+# ✅ TAB 5 — JD Analyzer
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_jd_tab(ss):
+    st.subheader("📄 Job Description Analyzer")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        jd_file = st.file_uploader("Upload JD (PDF)", type=["pdf"])
+        jd_text_manual = st.text_area("Paste JD text here", height=200)
+
+        if st.button("Analyze JD"):
+            jd_text = extract_jd_text(jd_file, jd_text_manual)
+            if not jd_text.strip():
+                st.warning("No JD content found.")
+            else:
+                ss.jd_text = jd_text
+                chunks = chunk_jd_text(jd_text)
+                if len(chunks) > 1:
+                    with st.spinner("Summarizing long JD in parts..."):
+                        ss.jd_summary = jd_summary(jd_text, chunks=chunks)
+                else:
+                    placeholder = st.empty()
+                    raw = ""
+                    for piece in stream_jd_summary(jd_text):
+                        raw += piece
+                        placeholder.info(raw)
+                    placeholder.empty()
+                    ss.jd_summary = parse_jd_summary(raw)
+                ss.jd_skills = extract_jd_skills(jd_text)
+
+    with col2:
+        if ss.get("jd_summary"):
+            st.write("### JD Summary")
+            st.info(ss.jd_summary["summary"])
+            st.write("**Must-have:**", ss.jd_summary["must_have"])
+            st.write("**Nice-to-have:**", ss.jd_summary["nice_to_have"])
+
+    if ss.get("jd_skills") and ss.skills:
+        matched, missing = compare_resume_vs_jd(ss.skills, ss.jd_skills)
+        c1, c2 = st.columns(2)
+        c1.metric("Matched Skills", len(matched))
+        c2.metric("Missing Skills", len(missing))
+        st.write("✅ Matched:", matched or "-")
+        st.write("❌ Missing:", missing or "-")
+
+    # ---- Saved JD index: store analyzed JDs, find best matches for the resume ----
+    st.markdown("---")
+    jd_index = get_jd_index()
+    c1, c2 = st.columns(2)
+    with c1:
+        if ss.get("jd_skills"):
+            jd_title = st.text_input("Title for this JD", value="")
+            if st.button("Save JD to index"):
+                jd_index.add(ss.jd_text, title=jd_title, skills=ss.jd_skills, must_have=must_have_skills(ss.jd_summary))
+                st.success(f"Saved. {len(jd_index)} JDs indexed.")
+    with c2:
+        if ss.skills and len(jd_index):
+            only_must = st.checkbox("Only JDs whose must-haves I cover")
+            top = jd_index.query(ss.skills, k=10, require_must=only_must)
+            st.write(f"### 🔎 Best matching saved JDs ({len(jd_index)} indexed)")
+            if top:
+                st.table([
+                    {"JD": r["title"] or r["ref"], "Coverage": f"{r['coverage']}%",
+                     "Missing": ", ".join(r["missing"]) or "-"}
+                    for r in top
+                ])
+            else:
+                st.info("No saved JD matches your skills yet.")
+
+
+# -----------------------------------------------------------------------------
+# ✅ TAB 8 — Analytics
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_analytics_tab(ss):
+    st.subheader("📊 Performance Analytics")
+    # Other tabs record results without rerunning this one
+    st.button("🔄 Refresh", key="analytics_refresh")
+
+    # ✅ Summaries are maintained as attempts are logged; no raw rows are read here
+    log = get_attempt_log()
+    mine, everyone = log.totals(ss.user_id), log.totals()
+    if not everyone["attempts"]:
+        st.info("No analytics yet.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Your attempts", mine["attempts"])
+    c2.metric("Your accuracy", f"{mine['accuracy']}%")
+    c3.metric("All users", f"{everyone['accuracy']}%", help=f"{everyone['attempts']} attempts by {everyone['users']} users")
+
+    trend = log.user_trend(ss.user_id)
+    if trend:
+        st.markdown("**Your accuracy by day**")
+        st.line_chart(pd.DataFrame(trend).set_index("day")[["accuracy"]])
+
+    st.markdown("**Accuracy by skill and difficulty (all users)**")
+    st.dataframe(pd.DataFrame(log.accuracy_by_cell()), use_container_width=True, hide_index=True)
+
+    hist = log.time_left_histogram()
+    if hist:
+        st.markdown("**Practice answers by seconds left**")
+        st.bar_chart(pd.DataFrame(hist).set_index("time_left_s")[["answers"]])
+
+
+# -----------------------------------------------------------------------------
+# ✅ TAB 9 — Export
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_export_tab(ss):
+    st.subheader("📄 Export Full Report")
+
+    if st.button("Generate PDF"):
+        all_q = deduplicate_text_list(ss.hr_questions + ss.tech_questions)
+        ss.mcqs = deduplicate_mcq_list(ss.mcqs)
+
+        pdf_bytes = export_pdf_bytes(
+            all_q, ss.answers, ss.mcqs, ss.ats,
+            ss.suggestions, ss.analytics["mcq_rows"],
+            practice_results=ss.practice_results,
+            per_q_time=ss.practice_per_q
+        )
+
+        ss.pdf_bytes = pdf_bytes
+
+    if ss.get("pdf_bytes"):
+        st.download_button(
+            "Download Report",
+            ss.pdf_bytes,
+            "AI_Interview_Report.pdf",
+            "application/pdf"
+        )
+
+
 # -----------------------------------------------------------------------------
 # MAIN APPLICATION
 # -----------------------------------------------------------------------------
@@ -110,7 +447,14 @@ def main():
 
         uploaded = st.file_uploader("Upload Resume (PDF)", type=["pdf"])
         if uploaded:
-            ss.resume_text = extract_text_from_pdf(uploaded)
+            # Pages are scanned as they are parsed, so early skills show up immediately
+            progress = st.empty()
+            pages = []
+            for page_no, page, early in iter_page_skills(uploaded):
+                pages.append(page)
+                progress.caption(f"Scanning page {page_no}… {len(early)} skills so far")
+            progress.empty()
+            ss.resume_text = "".join(t + "\n" for t in pages)
             ss.skills = extract_skills(ss.resume_text)
             ss.ats = get_ats_score(ss.skills, ss.role)
             st.success(f"Extracted {len(ss.skills)} skills.")
@@ -119,6 +463,9 @@ def main():
             st.caption("Detected:")
             st.write(", ".join(ss.skills))
 
+        with st.expander("⏱️ Startup timings"):
+            st.json(startup_report())
+
     # ===================== TITLE =========================
     st.title("🧠 AI Interview Helper")
 
@@ -134,201 +481,34 @@ def main():
         "Export"
     ])
 
-    # =======================================================================
-    # ✅ TAB 1 — ATS + Resume Suggestions
-    # =======================================================================
+    # ✅ Each tab is a fragment: its widgets rerun only that tab, not the whole app
     with tab1:
-        st.subheader("✅ ATS Skill Matcher")
-
-        score, matched, missing = ss.ats
-
-        c1, c2, c3 = st.columns(3)
-        c1.metric("ATS Score", f"{score}%")
-        c2.metric("Matched Skills", len(matched))
-        c3.metric("Missing Skills", len(missing))
+        render_ats_tab(ss)
 
-        st.write("✅ **Matched:**", matched or "-")
-        st.write("❌ **Missing:**", missing or "-")
-
-        if st.button("Generate Resume Suggestions"):
-            ss.suggestions = resume_suggestions(ss.skills, missing, ss.role)
-
-        if ss.suggestions:
-            st.success("\n".join([f"• {s}" for s in ss.suggestions]))
-
-    # =======================================================================
-    # ✅ TAB 2 — HR + Technical Questions
-    # =======================================================================
     with tab2:
-        st.subheader("🎤 HR & Technical Question Generator")
-
-        n_q = st.slider("How many questions?", 3, 20, 8)
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            if st.button("Generate HR Questions"):
-                qs = ai_hr_questions(ss.role, ss.level, n_q) if ss.use_ai else simple_hr_questions(ss.role, ss.level, n_q)
-                ss.hr_questions = deduplicate_text_list(qs)
-
-        with col2:
-            if st.button("Generate Technical Questions"):
-                qs = ai_tech_questions(ss.role, ss.level, n_q, ss.skills) if ss.use_ai else simple_tech_questions(ss.role, ss.level, ss.skills, n_q)
-                ss.tech_questions = deduplicate_text_list(qs)
-
-        # Display HR
-        if ss.hr_questions:
-            st.markdown("### 👥 HR Questions")
-            for i, q in enumerate(ss.hr_questions, start=1):
-                with st.expander(f"{i}. {q}"):
-                    if st.button(f"Answer HR {i}"):
-                        ans = generate_answer(q, ss.role, ss.level)
-                        if len(ss.answers) < i:
-                            ss.answers += [""] * (i - len(ss.answers))
-                        ss.answers[i - 1] = ans
-                    st.write(ss.answers[i - 1] if len(ss.answers) >= i else "")
-
-        # Display Technical
-        if ss.tech_questions:
-            st.markdown("### 💻 Technical Questions")
-            base = len(ss.hr_questions)
-            for i, q in enumerate(ss.tech_questions, start=1):
-                idx = base + i
-                with st.expander(f"{i}. {q}"):
-                    if st.button(f"Answer Tech {i}"):
-                        ans = generate_answer(q, ss.role, ss.level)
-                        if len(ss.answers) < idx:
-                            ss.answers += [""] * (idx - len(ss.answers))
-                        ss.answers[idx - 1] = ans
-                    st.write(ss.answers[idx - 1] if len(ss.answers) >= idx else "")
+        render_questions_tab(ss)
 
-    # =======================================================================
-    # ✅ TAB 3 — MCQ Generator
-    # =======================================================================
     with tab3:
-        st.subheader("📝 MCQ Generator + Checking")
-        n_mcq = st.slider("MCQs count", 5, 60, 12)
-
-        if st.button("Generate MCQs"):
-            ss.mcqs = generate_ai_mcqs(ss.role, ss.skills, n_mcq, ss.level) if ss.use_ai else generate_mcqs(ss.role, ss.skills, n_mcq, ss.level)
-            ss.mcqs = deduplicate_mcq_list(ss.mcqs)
-            ss.mcq_score = 0
-            ss.analytics["mcq_rows"] = []
-
-        for i, m in enumerate(ss.mcqs):
-            st.markdown(f"### Q{i+1}: {m['question']}")
-            st.caption(difficulty_badge(m.get("difficulty", "")))
-
-            choice = st.radio("Choose:", m["options"], key=f"mcq_{i}")
-            correct = m["options"][m["answer_index"]]
-
-            if st.button(f"Check {i+1}"):
-                is_correct = (choice == correct)
-                points = 5 if is_correct else -1
+        render_mcq_tab(ss)
 
-                if is_correct:
-                    st.success(f"✅ Correct! {m['explanation']}")
-                    ss.mcq_score += points
-                else:
-                    st.error(f"❌ Wrong. Correct: {correct}")
-
-                ss.analytics["mcq_rows"].append({
-                    "q#": i + 1, "difficulty": m.get("difficulty", ""),
-                    "selected": choice, "correct": correct,
-                    "is_correct": is_correct, "score": points
-                })
-
-        if ss.mcqs:
-            st.info(f"Score: {ss.mcq_score} / {len(ss.mcqs) * 5}")
-
-    # =======================================================================
-    # ✅ TAB 4 — Timed Practice Mode
-    # =======================================================================
     with tab4:
-        from modules.scoring import score_mcq
-        render_practice_block(ss, DIFFICULTY_SETTINGS, score_mcq, use_ai=ss.use_ai)
+        render_practice_tab(ss)
 
-    # =======================================================================
-    # ✅ TAB 5 — JD Analyzer
-    # =======================================================================
     with tabJD:
-        st.subheader("📄 Job Description Analyzer")
+        render_jd_tab(ss)
 
-        col1, col2 = st.columns(2)
-
-        with col1:
-            jd_file = st.file_uploader("Upload JD (PDF)", type=["pdf"])
-            jd_text_manual = st.text_area("Paste JD text here", height=200)
-
-            if st.button("Analyze JD"):
-                jd_text = extract_jd_text(jd_file, jd_text_manual)
-                if not jd_text.strip():
-                    st.warning("No JD content found.")
-                else:
-                    ss.jd_text = jd_text
-                    ss.jd_summary = jd_summary(jd_text)
-                    ss.jd_skills = extract_jd_skills(jd_text)
-
-        with col2:
-            if ss.get("jd_summary"):
-                st.write("### JD Summary")
-                st.info(ss.jd_summary["summary"])
-                st.write("**Must-have:**", ss.jd_summary["must_have"])
-                st.write("**Nice-to-have:**", ss.jd_summary["nice_to_have"])
-
-        if ss.get("jd_skills") and ss.skills:
-            matched, missing = compare_resume_vs_jd(ss.skills, ss.jd_skills)
-            c1, c2 = st.columns(2)
-            c1.metric("Matched Skills", len(matched))
-            c2.metric("Missing Skills", len(missing))
-            st.write("✅ Matched:", matched or "-")
-            st.write("❌ Missing:", missing or "-")
-
-
-    # =======================================================================
-    # ✅ TAB Voice — Voice Interview
-    # =======================================================================
     with tabVoice:
         render_voice_interview(ss)
 
-    # =======================================================================
-    # ✅ TAB 8 — Analytics
-    # =======================================================================
     with tab5:
-        st.subheader("📊 Performance Analytics")
-        rows = ss.analytics.get("mcq_rows", [])
-        if rows:
-            df = pd.DataFrame(rows)
-            st.dataframe(df, use_container_width=True)
-        else:
-            st.info("No analytics yet.")
-
-    # =======================================================================
-    # ✅ TAB 9 — Export
-    # =======================================================================
+        render_analytics_tab(ss)
+
     with tab6:
-        st.subheader("📄 Export Full Report")
-
-        if st.button("Generate PDF"):
-            all_q = deduplicate_text_list(ss.hr_questions + ss.tech_questions)
-            ss.mcqs = deduplicate_mcq_list(ss.mcqs)
-
-            pdf_bytes = export_pdf_bytes(
-                all_q, ss.answers, ss.mcqs, ss.ats,
-                ss.suggestions, ss.analytics["mcq_rows"],
-                practice_results=ss.practice_results,
-                per_q_time=ss.practice_per_q
-            )
-
-            ss.pdf_bytes = pdf_bytes
-
-        if ss.get("pdf_bytes"):
-            st.download_button(
-                "Download Report",
-                ss.pdf_bytes,
-                "AI_Interview_Report.pdf",
-                "application/pdf"
-            )
+        render_export_tab(ss)
+
+    # ✅ First paint is done; warm everything else in the background
+    mark("first_paint")
+    start_background_preload()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+import os
+
+LLM_MODEL_NAME = os.environ.get("LLM_MODEL_NAME", "google/flan-t5-base")
+
+# Micro-batching: generate_text calls that arrive within LLM_BATCH_MAX_WAIT_MS
+# of each other (and share decoding parameters) are padded into one generate call.
+LLM_BATCH_MAX_SIZE = int(os.environ.get("LLM_BATCH_MAX_SIZE", "8"))
+LLM_BATCH_MAX_WAIT_MS = int(os.environ.get("LLM_BATCH_MAX_WAIT_MS", "25"))
+
+# Decode greedily instead of sampling so identical prompts give identical,
+# cache-stable completions.
+LLM_DETERMINISTIC = os.environ.get("LLM_DETERMINISTIC", "0") == "1"
+
+# Persistent completion cache (SQLite), keyed by prompt + model + decoding params.
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# Sampled (non-deterministic) completions are cached in this many slots per
+# prompt, one picked at random per call, so repeated clicks rotate through up
+# to N different completions instead of replaying one. 0 = never cache them.
+LLM_CACHE_SAMPLE_SLOTS = int(os.environ.get("LLM_CACHE_SAMPLE_SLOTS", "4"))
+
+# Inference backend: "torch" (fp32), "torch-int8" (dynamic int8 Linear layers)
+# or "onnx" (ONNX Runtime via optimum). Non-fp32 backends are checked against
+# fp32 on a fixed prompt set at startup and fall back to fp32 below the threshold.
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "torch")
+LLM_PARITY_CHECK = os.environ.get("LLM_PARITY_CHECK", "1") == "1"
+LLM_PARITY_THRESHOLD = float(os.environ.get("LLM_PARITY_THRESHOLD", "0.8"))
+
+# Wall-clock budget (seconds) for interactive question/MCQ generation. When it
+# runs out, whatever has been decoded so far is returned. 0 = no limit.
+LLM_INTERACTIVE_MAX_TIME_S = float(os.environ.get("LLM_INTERACTIVE_MAX_TIME_S", "45"))
+
+# Encoder input limit of the model; longer inputs are chunked by callers
+# (e.g. jd_analyzer) instead of being silently truncated.
+LLM_MAX_INPUT_TOKENS = int(os.environ.get("LLM_MAX_INPUT_TOKENS", "512"))
+
+# Background pre-generation: warm pools of AI questions/MCQs per role x level,
+# refilled while the LLM is idle so interactive requests can be served instantly.
+PREGEN_ENABLED = os.environ.get("PREGEN_ENABLED", "1") == "1"
+PREGEN_DEPTH_HR = int(os.environ.get("PREGEN_DEPTH_HR", "20"))
+PREGEN_DEPTH_TECH = int(os.environ.get("PREGEN_DEPTH_TECH", "20"))
+PREGEN_DEPTH_MCQ = int(os.environ.get("PREGEN_DEPTH_MCQ", "30"))
+PREGEN_BATCH = int(os.environ.get("PREGEN_BATCH", "10"))
+PREGEN_IDLE_SLEEP_S = float(os.environ.get("PREGEN_IDLE_SLEEP_S", "2"))
+# A pool whose refills keep adding nothing backs off: retried after
+# PREGEN_RETRY_S, doubling per further miss up to PREGEN_RETRY_MAX_S.
+PREGEN_RETRY_S = float(os.environ.get("PREGEN_RETRY_S", "30"))
+PREGEN_RETRY_MAX_S = float(os.environ.get("PREGEN_RETRY_MAX_S", "900"))
+
+# Offline MCQ corpus (python -m modules.mcq_corpus build): MCQs for every
+# SKILL_KEYWORDS x difficulty generated ahead of time, written as one compact
+# file and memory-mapped by the app; generate_ai_mcqs serves from it first.
+MCQ_CORPUS_PATH = os.environ.get("MCQ_CORPUS_PATH", os.path.join(".cache", "mcq_corpus.bin"))
+MCQ_CORPUS_PER_CELL = int(os.environ.get("MCQ_CORPUS_PER_CELL", "30"))
@@ -22,3 +22,16 @@ SKILL_KEYWORDS: List[str] = list({
     "docker", "kubernetes", "git", "github", "gitlab", "ci/cd", "terraform", "linux", "cloud", "aws", "gcp", "azure",
     "communication", "teamwork", "leadership", "problem solving", "agile", "scrum",
 })
+
+# Alternate spellings -> canonical SKILL_KEYWORDS entry (used by SkillMatcher).
+SKILL_ALIASES: Dict[str, str] = {
+    "python3": "python",
+    "ml": "machine learning", "natural language processing": "nlp",
+    "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "js": "javascript", "reactjs": "react", "react.js": "react",
+    "nodejs": "node", "node.js": "node", "expressjs": "express", "vuejs": "vue", "vue.js": "vue",
+    "restful": "rest", "rest api": "rest",
+    "k8s": "kubernetes", "ci cd": "ci/cd", "cicd": "ci/cd", "ci-cd": "ci/cd",
+    "amazon web services": "aws", "google cloud": "gcp", "google cloud platform": "gcp",
+    "microsoft azure": "azure", "team work": "teamwork", "problem-solving": "problem solving",
+}
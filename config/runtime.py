@@ -0,0 +1,68 @@
+import os
+
+# Import spaCy, pandas, reportlab, speech libs and the LLM on a background
+# thread after the first page paint instead of on first use.
+PRELOAD_ENABLED = os.environ.get("PRELOAD_ENABLED", "1") == "1"
+
+# Shared model server (python -m modules.model_server). When MODEL_SERVER_URL
+# is set, generate_text and extract_skills call it instead of loading
+# flan-t5/spaCy in every Streamlit process, falling back in-process if it is down.
+MODEL_SERVER_URL = os.environ.get("MODEL_SERVER_URL", "").rstrip("/")
+MODEL_SERVER_FALLBACK = os.environ.get("MODEL_SERVER_FALLBACK", "1") == "1"
+MODEL_SERVER_TIMEOUT_S = float(os.environ.get("MODEL_SERVER_TIMEOUT_S", "120"))
+MODEL_SERVER_HOST = os.environ.get("MODEL_SERVER_HOST", "127.0.0.1")
+MODEL_SERVER_PORT = int(os.environ.get("MODEL_SERVER_PORT", "8765"))
+# Requests admitted at once (queued + running); beyond this the server answers 503.
+MODEL_SERVER_MAX_QUEUE = int(os.environ.get("MODEL_SERVER_MAX_QUEUE", "64"))
+# Intra-op torch threads for the whole server (0 = torch default).
+MODEL_SERVER_THREADS = int(os.environ.get("MODEL_SERVER_THREADS", "0"))
+
+# spaCy skill extraction: only the components noun_chunks needs are loaded
+# (tok2vec, tagger, attribute_ruler, parser); NER and the lemmatizer are excluded.
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+SPACY_EXCLUDE = ["ner", "lemmatizer"]
+SPACY_BATCH_SIZE = int(os.environ.get("SPACY_BATCH_SIZE", "32"))
+SPACY_N_PROCESS = int(os.environ.get("SPACY_N_PROCESS", "1"))
+
+# PDF text extraction: results are cached on disk by SHA-256 of the PDF bytes.
+# Documents with at least PDF_PARALLEL_MIN_PAGES pages are split across
+# PDF_WORKERS processes; pages beyond PDF_MAX_PAGES and files larger than
+# PDF_MAX_BYTES are not extracted.
+PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR", os.path.join(".cache", "pdf_text"))
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", "50"))
+PDF_MAX_BYTES = int(os.environ.get("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "16"))
+
+# Persistent inverted index of job descriptions (skill -> JD postings).
+JD_INDEX_PATH = os.environ.get("JD_INDEX_PATH", os.path.join(".cache", "jd_index.sqlite3"))
+
+# Near-duplicate question detection (MinHash + LSH): Jaccard similarity of
+# order-aware content-word shingles (DEDUP_SHINGLE_SIZE words each) at or above
+# DEDUP_NEAR_THRESHOLD counts as a duplicate. More permutations = fewer
+# missed candidates, slower hashing.
+DEDUP_NEAR_THRESHOLD = float(os.environ.get("DEDUP_NEAR_THRESHOLD", "0.7"))
+DEDUP_NUM_PERM = int(os.environ.get("DEDUP_NUM_PERM", "64"))
+DEDUP_SHINGLE_SIZE = int(os.environ.get("DEDUP_SHINGLE_SIZE", "2"))
+
+# MCQ question bank (SQLite), indexed by skill x difficulty. Seeded from
+# modules.mcq_generator.QUESTION_BANK on first use; grow it with
+# `python -m modules.question_bank import items.jsonl`.
+QUESTION_BANK_PATH = os.environ.get("QUESTION_BANK_PATH", os.path.join(".cache", "question_bank.sqlite3"))
+
+# Append-only log of every MCQ check and practice answer, with summary tables
+# kept up to date on write; the Analytics tab reads only the summaries.
+ATTEMPT_LOG_PATH = os.environ.get("ATTEMPT_LOG_PATH", os.path.join(".cache", "attempts.sqlite3"))
+
+# MCQ tab: questions rendered per page; each page is graded with one form submit.
+MCQ_PAGE_SIZE = int(os.environ.get("MCQ_PAGE_SIZE", "10"))
+
+# Adaptive practice (modules.adaptive), the Practice Mode toggle's default:
+# questions are picked to match a running ability estimate, and a session ends
+# early once the estimate's standard error drops to ADAPTIVE_TARGET_SE after
+# at least ADAPTIVE_MIN_ITEMS answers.
+# ADAPTIVE_SPEED_WEIGHT is how much of a correct answer's credit depends on speed.
+ADAPTIVE_PRACTICE = os.environ.get("ADAPTIVE_PRACTICE", "0") == "1"
+ADAPTIVE_MIN_ITEMS = int(os.environ.get("ADAPTIVE_MIN_ITEMS", "10"))
+ADAPTIVE_TARGET_SE = float(os.environ.get("ADAPTIVE_TARGET_SE", "0.5"))
+ADAPTIVE_SPEED_WEIGHT = float(os.environ.get("ADAPTIVE_SPEED_WEIGHT", "0.2"))
@@ -0,0 +1,151 @@
+"""
+Adaptive practice: a Rasch (one-parameter IRT) ability estimate that is
+updated in O(1) per answer, and a pool of MCQs indexed by item difficulty,
+so the next question (the one nearest the current estimate) is a bisect
+away however large the pool is.
+"""
+import bisect
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from config.runtime import ADAPTIVE_MIN_ITEMS, ADAPTIVE_TARGET_SE, ADAPTIVE_SPEED_WEIGHT
+
+# Item difficulty on the ability (logit) scale, from the MCQ's tag.
+DIFFICULTY_B = {"easy": -1.0, "intermediate": 0.0, "advanced": 1.0}
+
+# Starting ability for the level picked in the sidebar.
+LEVEL_THETA = {"Beginner": -0.5, "Intermediate": 0.0, "Advanced": 0.5}
+
+# Weight of the N(theta0, 1) prior, in answers' worth of Fisher information.
+_PRIOR_INFO = 1.0
+_THETA_LIMIT = 3.0
+
+
+def item_difficulty(m: Dict) -> float:
+    """A calibrated "rating" if the MCQ has one, else its difficulty tag."""
+    rating = m.get("rating")
+    if isinstance(rating, (int, float)):
+        return float(rating)
+    return DIFFICULTY_B.get(m.get("difficulty", ""), 0.0)
+
+
+def answer_outcome(points: int, time_left: float, time_limit: float,
+                   speed_weight: float = ADAPTIVE_SPEED_WEIGHT) -> float:
+    """
+    Credit in [0, 1] for one answer scored by score_mcq: 0 when wrong
+    (points <= 0), between 1 - speed_weight and 1 when right, more for a
+    faster answer.
+    """
+    if points <= 0:
+        return 0.0
+    frac = min(1.0, max(0.0, time_left / time_limit)) if time_limit > 0 else 1.0
+    return 1.0 - speed_weight * (1.0 - frac)
+
+
+class AbilityEstimate:
+    """
+    Running ability estimate. Each answer moves theta by (outcome - p) / I,
+    where p is the chance of a right answer at the current theta and I the
+    Fisher information gathered so far (prior included): a Newton step on
+    the posterior that shrinks as evidence builds up. 1 / sqrt(I) is the
+    standard error.
+    """
+
+    __slots__ = ("theta", "info", "n")
+
+    def __init__(self, theta: float = 0.0):
+        self.theta = theta
+        self.info = _PRIOR_INFO
+        self.n = 0
+
+    def expected(self, b: float) -> float:
+        return 1.0 / (1.0 + math.exp(b - self.theta))
+
+    def update(self, b: float, outcome: float):
+        p = self.expected(b)
+        self.info += p * (1.0 - p)
+        self.theta = min(_THETA_LIMIT, max(-_THETA_LIMIT, self.theta + (outcome - p) / self.info))
+        self.n += 1
+
+    @property
+    def se(self) -> float:
+        return 1.0 / math.sqrt(self.info)
+
+
+class ItemPool:
+    """MCQs bucketed by difficulty; the bucket keys are kept sorted for bisect."""
+
+    def __init__(self):
+        self._keys: List[float] = []
+        self._buckets: Dict[float, Deque[Dict]] = {}
+        self._size = 0
+
+    def add(self, m: Dict):
+        b = item_difficulty(m)
+        if b not in self._buckets:
+            bisect.insort(self._keys, b)
+            self._buckets[b] = deque()
+        self._buckets[b].append(m)
+        self._size += 1
+
+    def pop_nearest(self, theta: float) -> Optional[Dict]:
+        """Remove and return an item whose difficulty is closest to theta."""
+        if not self._keys:
+            return None
+        i = bisect.bisect_left(self._keys, theta)
+        if i == len(self._keys) or (i > 0 and theta - self._keys[i - 1] <= self._keys[i] - theta):
+            i -= 1
+        b = self._keys[i]
+        bucket = self._buckets[b]
+        m = bucket.popleft()
+        if not bucket:
+            del self._buckets[b]
+            del self._keys[i]
+        self._size -= 1
+        return m
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class AdaptiveSession:
+    """
+    Serves MCQs one at a time from a (possibly still growing) source list,
+    each matched to the current ability estimate, until the estimate is
+    precise enough or `max_items` have been served.
+    """
+
+    def __init__(self, level: str, max_items: int, min_items: int = ADAPTIVE_MIN_ITEMS,
+                 target_se: float = ADAPTIVE_TARGET_SE):
+        self.ability = AbilityEstimate(LEVEL_THETA.get(level, 0.0))
+        self.pool = ItemPool()
+        self.max_items = max_items
+        self.min_items = min_items
+        self.target_se = target_se
+        self.served = 0
+        self._ingested = 0
+
+    def ingest(self, source: List[Dict]):
+        """Pool the items appended to `source` since the last call."""
+        for m in source[self._ingested:]:
+            self.pool.add(m)
+        self._ingested = len(source)
+
+    def next_item(self) -> Optional[Dict]:
+        if self.finished:
+            return None
+        m = self.pool.pop_nearest(self.ability.theta)
+        if m is not None:
+            self.served += 1
+        return m
+
+    def record(self, m: Dict, points: int, time_left: float, time_limit: float):
+        self.ability.update(item_difficulty(m), answer_outcome(points, time_left, time_limit))
+
+    @property
+    def converged(self) -> bool:
+        return self.ability.n >= self.min_items and self.ability.se <= self.target_se
+
+    @property
+    def finished(self) -> bool:
+        return self.converged or self.served >= self.max_items
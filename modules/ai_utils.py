@@ -1,5 +1,5 @@
 import re
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
 
 def split_lines(s: str) -> List[str]:
     return [l.strip() for l in s.replace("\r", "\n").split("\n") if l.strip()]
@@ -12,23 +12,80 @@ def parse_bulleted(items_text: str) -> List[str]:
         out.append(l)
     return out
 
+_MCQ_SEPARATOR = re.compile(r"(?m)^\s*[-]{3,}\s*$")
+
+
+def _parse_mcq(b: str):
+    q_m = re.search(r"Q\s*:\s*(.+)", b)
+    opts = re.findall(r"^[A-D]\)\s*(.+)", b, flags=re.M)
+    corr_m = re.search(r"Correct\s*:\s*([A-D])", b)
+    exp_m = re.search(r"Explanation\s*:\s*(.+)", b, flags=re.S)
+    if q_m and len(opts) >= 4 and corr_m:
+        idx = "ABCD".index(corr_m.group(1))
+        return {
+            "question": q_m.group(1).strip(),
+            "options": [o.strip() for o in opts[:4]],
+            "answer_index": idx,
+            "explanation": (exp_m.group(1).strip() if exp_m else ""),
+            "difficulty": "",  # optional tag
+        }
+    return None
+
+_NUMBERED_ITEM = re.compile(r"(?:^|\s)\d+[.)]\s")
+_BULLET_LINE = re.compile(r"^\s*(?:[-•*]|\d+[.)])\s*\S")
+_MCQ_END = re.compile(r"Explanation\s*:[^\n]*?(?:\n|-{3,}|(?=\bQ\s*:))")
+
+def count_complete_bullets(txt: str) -> int:
+    # Finished items only: newline-terminated bullet/numbered lines (a preamble is not an item),
+    # or numbered items already followed by the next number
+    lines = txt.replace("\r", "\n").split("\n")[:-1]
+    return max(sum(1 for l in lines if _BULLET_LINE.match(l)), len(_NUMBERED_ITEM.findall(txt)) - 1)
+
+def count_complete_mcqs(txt: str) -> int:
+    # An MCQ block is complete once its Explanation line has ended
+    return len(_MCQ_END.findall(txt))
+
 def parse_ai_mcq_block(txt: str) -> List[Dict]:
     out = []
-    blocks = re.split(r"(?m)^\s*[-]{3,}\s*$", txt.strip())
+    blocks = _MCQ_SEPARATOR.split(txt.strip())
     for b in blocks:
         if not b.strip():
             continue
-        q_m = re.search(r"Q\s*:\s*(.+)", b)
-        opts = re.findall(r"^[A-D]\)\s*(.+)", b, flags=re.M)
-        corr_m = re.search(r"Correct\s*:\s*([A-D])", b)
-        exp_m = re.search(r"Explanation\s*:\s*(.+)", b, flags=re.S)
-        if q_m and len(opts) >= 4 and corr_m:
-            idx = "ABCD".index(corr_m.group(1))
-            out.append({
-                "question": q_m.group(1).strip(),
-                "options": [o.strip() for o in opts[:4]],
-                "answer_index": idx,
-                "explanation": (exp_m.group(1).strip() if exp_m else ""),
-                "difficulty": "",  # optional tag
-            })
+        m = _parse_mcq(b)
+        if m:
+            out.append(m)
     return out
+
+class MCQStreamParser:
+    """
+    Incremental parse_ai_mcq_block: feed() text as it streams in and get
+    back each MCQ once the "---" line closing its block has arrived;
+    close() parses the final, unterminated block.
+    """
+
+    def __init__(self):
+        self._buf = ""
+
+    def feed(self, chunk: str) -> List[Dict]:
+        self._buf += chunk
+        out = []
+        while True:
+            # A separator only counts once its line is complete
+            sep = next((s for s in _MCQ_SEPARATOR.finditer(self._buf) if "\n" in self._buf[s.end() - 1:]), None)
+            if sep is None:
+                return out
+            block, self._buf = self._buf[:sep.start()], self._buf[sep.end():]
+            m = _parse_mcq(block) if block.strip() else None
+            if m:
+                out.append(m)
+
+    def close(self) -> List[Dict]:
+        block, self._buf = self._buf, ""
+        m = _parse_mcq(block) if block.strip() else None
+        return [m] if m else []
+
+def iter_ai_mcqs(chunks: Iterable[str]) -> Iterator[Dict]:
+    parser = MCQStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
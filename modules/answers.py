@@ -1,10 +1,27 @@
-from modules.question_ai import generate_ai_answer
+from typing import Iterator
+from modules.question_ai import generate_ai_answer, stream_ai_answer
 
-def generate_answer(question: str, role: str, level: str) -> str:
-    ans = (generate_ai_answer(question, role, level) or "").strip()
-    if ans:
-        return ans
+def _fallback_answer(role: str, level: str) -> str:
     return (
         f"Answer outline: 1) Context 2) Approach 3) Key decisions 4) Result (metrics) 5) Learnings. "
         f"Tailor to {role}, keep it {level.lower()} depth, quantify impact."
     )
+
+def generate_answer(question: str, role: str, level: str) -> str:
+    ans = (generate_ai_answer(question, role, level) or "").strip()
+    if ans:
+        return ans
+    return _fallback_answer(role, level)
+
+def stream_answer(question: str, role: str, level: str) -> Iterator[str]:
+    """
+    Streaming counterpart of generate_answer: yields text as the LLM decodes it,
+    or the static outline if the LLM produces nothing.
+    """
+    produced = False
+    for piece in stream_ai_answer(question, role, level):
+        if piece.strip():
+            produced = True
+        yield piece
+    if not produced:
+        yield _fallback_answer(role, level)
@@ -1,7 +1,10 @@
-from typing import List, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple
 from modules.llm import generate_text
+from modules.lazy import lazy_import
 from config.roles import ROLE_SKILLS
 
+np = lazy_import("numpy")
+
 def get_ats_score(extracted: List[str], role: str) -> Tuple[int, List[str], List[str]]:
     req = ROLE_SKILLS.get(role, [])
     if not req:
@@ -11,6 +14,77 @@ def get_ats_score(extracted: List[str], role: str) -> Tuple[int, List[str], List
     score = int((len(matched) / max(1, len(req))) * 100)
     return score, matched, missing
 
+def skill_matrix(skill_lists: List[List[str]], vocab: Dict[str, int]):
+    """Boolean (len(skill_lists) x len(vocab)) membership matrix; unknown skills are ignored."""
+    m = np.zeros((len(skill_lists), len(vocab)), dtype=bool)
+    for i, skills in enumerate(skill_lists):
+        cols = [vocab[s] for s in skills if s in vocab]
+        m[i, cols] = True
+    return m
+
+
+def score_matrix(
+    candidates: List[List[str]],
+    targets: Optional[Dict[str, List[str]]] = None,
+    weights: Optional[Dict[str, float]] = None,
+):
+    """
+    ATS scores of every candidate against every target (roles by default, or
+    JD skill lists) in one pass: returns (scores, cand_matrix, target_matrix,
+    target_names, vocab). With no weights, scores equal get_ats_score's.
+    Weighted scores use the share of the target's skill weight that is matched.
+    """
+    targets = ROLE_SKILLS if targets is None else targets
+    names = list(targets)
+    vocab: Dict[str, int] = {}
+    for skills in targets.values():
+        for s in skills:
+            vocab.setdefault(s, len(vocab))
+    C = skill_matrix(candidates, vocab)
+    R = skill_matrix([targets[n] for n in names], vocab)
+    w = np.ones(len(vocab))
+    for s, v in (weights or {}).items():
+        if s in vocab:
+            w[vocab[s]] = v
+    Rw = R * w
+    matched = C.astype(float) @ Rw.T
+    total = Rw.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(total > 0, (matched / np.maximum(total, 1e-12)) * 100, 0).astype(int)
+    return scores, C, R, names, vocab
+
+
+def _split(c_row, target_skills: List[str], vocab: Dict[str, int]) -> Tuple[List[str], List[str]]:
+    matched = [s for s in target_skills if c_row[vocab[s]]]
+    missing = [s for s in target_skills if not c_row[vocab[s]]]
+    return matched, missing
+
+
+def top_roles(extracted: List[str], k: int = 3, targets: Optional[Dict[str, List[str]]] = None,
+              weights: Optional[Dict[str, float]] = None) -> List[Tuple[str, int, List[str], List[str]]]:
+    """Best-fit roles (or JDs) for one resume: [(name, score, matched, missing)]."""
+    targets = ROLE_SKILLS if targets is None else targets
+    scores, C, R, names, vocab = score_matrix([extracted], targets, weights)
+    order = np.argsort(-scores[0], kind="stable")[:k]
+    return [(names[j], int(scores[0, j]), *_split(C[0], targets[names[j]], vocab)) for j in order]
+
+
+def top_candidates(profiles: Dict[Hashable, List[str]], target: str, k: int = 10,
+                   targets: Optional[Dict[str, List[str]]] = None,
+                   weights: Optional[Dict[str, float]] = None) -> List[Tuple[Hashable, int, List[str], List[str]]]:
+    """Best candidates for one role (or JD) out of many stored profiles: [(id, score, matched, missing)]."""
+    targets = ROLE_SKILLS if targets is None else targets
+    ids = list(profiles)
+    scores, C, R, names, vocab = score_matrix([profiles[i] for i in ids], {target: targets[target]}, weights)
+    col = scores[:, 0]
+    k = min(k, len(ids))
+    if k <= 0:
+        return []
+    top = np.argpartition(-col, k - 1)[:k]
+    top = top[np.argsort(-col[top], kind="stable")]
+    return [(ids[i], int(col[i]), *_split(C[i], targets[target], vocab)) for i in top]
+
+
 def resume_suggestions(extracted: List[str], missing: List[str], role: str) -> List[str]:
     prompt = (
         "You are an ATS expert. Based on extracted skills: "
@@ -0,0 +1,229 @@
+"""
+Append-only log of MCQ attempts (MCQ tab checks and practice answers) in
+SQLite, shared by every session and user.
+
+Summary tables are updated in the same transaction as each append, so the
+Analytics tab reads a few pre-aggregated rows instead of scanning the raw
+attempts, however many there are.
+
+    python -m modules.attempt_log summary
+    python -m modules.attempt_log rescore --weights '{"Beginner": 1.0, "Intermediate": 1.5, "Advanced": 2.0}'
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+import streamlit as st
+from config.runtime import ATTEMPT_LOG_PATH
+from modules.scoring import MCQ_DIFFICULTY_WEIGHTS, score_mcq_batch
+
+MODES = ("check", "practice")
+
+# Width of the time-left histogram buckets; the practice time bonus also steps every 10 s.
+TIME_LEFT_BUCKET_S = 10
+
+_DAY_S = 86400
+
+
+class AttemptLog:
+    def __init__(self, path: str = ATTEMPT_LOG_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS attempts (
+                id INTEGER PRIMARY KEY, at REAL NOT NULL, user TEXT NOT NULL, mode TEXT NOT NULL,
+                qid INTEGER, skill TEXT NOT NULL, difficulty TEXT NOT NULL, level TEXT NOT NULL,
+                correct INTEGER NOT NULL, score INTEGER NOT NULL, time_left INTEGER);
+            CREATE TABLE IF NOT EXISTS agg_cell (
+                mode TEXT NOT NULL, skill TEXT NOT NULL, difficulty TEXT NOT NULL,
+                n INTEGER NOT NULL, n_correct INTEGER NOT NULL, score_sum INTEGER NOT NULL,
+                PRIMARY KEY (mode, skill, difficulty)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS agg_time_left (
+                mode TEXT NOT NULL, bucket INTEGER NOT NULL, n INTEGER NOT NULL, n_correct INTEGER NOT NULL,
+                PRIMARY KEY (mode, bucket)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS agg_user_day (
+                user TEXT NOT NULL, day INTEGER NOT NULL, mode TEXT NOT NULL,
+                n INTEGER NOT NULL, n_correct INTEGER NOT NULL, score_sum INTEGER NOT NULL,
+                PRIMARY KEY (user, day, mode)) WITHOUT ROWID;
+            """
+        )
+
+    def record(self, user: str, mode: str, rows: Iterable[Dict], level: str = "") -> int:
+        """
+        Append attempts and fold them into the summaries in one transaction.
+        Each row has skill, difficulty, is_correct and score, plus optional
+        id (question bank id) and time_left. Returns the number appended.
+        """
+        now = time.time()
+        day = int(now // _DAY_S)
+        attempts = []
+        cells: Counter = Counter()
+        buckets: Counter = Counter()
+        days: Counter = Counter()
+        for r in rows:
+            skill = (r.get("skill") or "general").lower()
+            diff = r.get("difficulty") or ""
+            ok = int(bool(r["is_correct"]))
+            score = int(r["score"])
+            time_left = r.get("time_left")
+            attempts.append((now, user, mode, r.get("id"), skill, diff, level, ok, score, time_left))
+            cells.update({(mode, skill, diff, "n"): 1, (mode, skill, diff, "c"): ok, (mode, skill, diff, "s"): score})
+            if time_left is not None:
+                b = int(time_left) // TIME_LEFT_BUCKET_S
+                buckets.update({(mode, b, "n"): 1, (mode, b, "c"): ok})
+            days.update({(user, day, mode, "n"): 1, (user, day, mode, "c"): ok, (user, day, mode, "s"): score})
+        if not attempts:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO attempts (at, user, mode, qid, skill, difficulty, level, correct, score, time_left)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                attempts,
+            )
+            self._conn.executemany(
+                "INSERT INTO agg_cell (mode, skill, difficulty, n, n_correct, score_sum) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (mode, skill, difficulty) DO UPDATE SET n = n + excluded.n,"
+                " n_correct = n_correct + excluded.n_correct, score_sum = score_sum + excluded.score_sum",
+                [(*k[:3], cells[(*k[:3], "n")], cells[(*k[:3], "c")], cells[(*k[:3], "s")])
+                 for k in cells if k[3] == "n"],
+            )
+            self._conn.executemany(
+                "INSERT INTO agg_time_left (mode, bucket, n, n_correct) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (mode, bucket) DO UPDATE SET n = n + excluded.n, n_correct = n_correct + excluded.n_correct",
+                [(*k[:2], buckets[(*k[:2], "n")], buckets[(*k[:2], "c")]) for k in buckets if k[2] == "n"],
+            )
+            self._conn.executemany(
+                "INSERT INTO agg_user_day (user, day, mode, n, n_correct, score_sum) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (user, day, mode) DO UPDATE SET n = n + excluded.n,"
+                " n_correct = n_correct + excluded.n_correct, score_sum = score_sum + excluded.score_sum",
+                [(*k[:3], days[(*k[:3], "n")], days[(*k[:3], "c")], days[(*k[:3], "s")])
+                 for k in days if k[3] == "n"],
+            )
+        return len(attempts)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(n), 0) FROM agg_cell").fetchone()[0]
+
+    def accuracy_by_cell(self, mode: Optional[str] = None) -> List[Dict]:
+        """Attempts, accuracy (%) and mean score per skill x difficulty, most attempted first."""
+        where = "WHERE mode = ?" if mode else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT skill, difficulty, SUM(n), SUM(n_correct), SUM(score_sum) FROM agg_cell {where}"
+                " GROUP BY skill, difficulty ORDER BY SUM(n) DESC, skill, difficulty",
+                (mode,) if mode else (),
+            ).fetchall()
+        return [{"skill": s, "difficulty": d, "attempts": n, "accuracy": round(100 * c / n, 1),
+                 "avg_score": round(sc / n, 2)} for s, d, n, c, sc in rows]
+
+    def time_left_histogram(self, mode: str = "practice") -> List[Dict]:
+        """Answers per time-left bucket and the accuracy within each."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, n, n_correct FROM agg_time_left WHERE mode = ? ORDER BY bucket", (mode,)
+            ).fetchall()
+        return [{"time_left_s": b * TIME_LEFT_BUCKET_S, "answers": n, "accuracy": round(100 * c / n, 1)}
+                for b, n, c in rows]
+
+    def user_trend(self, user: str, days: int = 30) -> List[Dict]:
+        """Per-day attempts, accuracy (%) and total score of one user over the last `days` days."""
+        since = int(time.time() // _DAY_S) - days + 1
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, SUM(n), SUM(n_correct), SUM(score_sum) FROM agg_user_day"
+                " WHERE user = ? AND day >= ? GROUP BY day ORDER BY day",
+                (user, since),
+            ).fetchall()
+        return [{"day": time.strftime("%Y-%m-%d", time.gmtime(d * _DAY_S)), "attempts": n,
+                 "accuracy": round(100 * c / n, 1), "score": sc} for d, n, c, sc in rows]
+
+    def totals(self, user: Optional[str] = None) -> Dict[str, float]:
+        """Attempts, accuracy (%) and users, for everyone or for one user."""
+        with self._lock:
+            if user is None:
+                n, c, users = self._conn.execute(
+                    "SELECT COALESCE(SUM(n), 0), COALESCE(SUM(n_correct), 0), COUNT(DISTINCT user) FROM agg_user_day"
+                ).fetchone()
+            else:
+                n, c = self._conn.execute(
+                    "SELECT COALESCE(SUM(n), 0), COALESCE(SUM(n_correct), 0) FROM agg_user_day WHERE user = ?",
+                    (user,),
+                ).fetchone()
+                users = 1 if n else 0
+        return {"attempts": n, "accuracy": round(100 * c / n, 1) if n else 0.0, "users": users}
+
+    def rescore(self, weights: Dict[str, float] = MCQ_DIFFICULTY_WEIGHTS, chunk: int = 200_000) -> Dict:
+        """
+        Practice totals per MCQ difficulty as they would be under `weights`,
+        alongside the scores actually logged. The raw attempts are read once,
+        in chunks, and scored with score_mcq_batch.
+        """
+        out: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT correct, level, time_left, difficulty, score FROM attempts WHERE mode = 'practice'"
+            )
+            while True:
+                rows = cur.fetchmany(chunk)
+                if not rows:
+                    break
+                correct, level, time_left, difficulty, logged = zip(*rows)
+                # Only right/wrong is logged: selected 0 vs correct 0 (right) or 1 (wrong)
+                scored = score_mcq_batch([0] * len(rows), [1 - c for c in correct], level, time_left,
+                                         difficulty=difficulty, weights=weights)
+                for d, b in scored.by_difficulty.items():
+                    acc = out.setdefault(d, {"n": 0, "correct": 0, "score": 0, "logged_score": 0})
+                    for k in ("n", "correct", "score"):
+                        acc[k] += b[k]
+                for d, s in zip(difficulty, logged):
+                    out[d]["logged_score"] += s
+        return out
+
+
+@st.cache_resource(show_spinner=False)
+def get_attempt_log() -> AttemptLog:
+    return AttemptLog()
+
+
+def record_attempts(user: str, mode: str, rows: Iterable[Dict], level: str = "") -> int:
+    """Log attempts from the UI; a full disk or locked database never breaks a quiz."""
+    try:
+        return get_attempt_log().record(user, mode, rows, level=level)
+    except sqlite3.Error:
+        return 0
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Summaries of the MCQ attempt log.")
+    ap.add_argument("--db", default=ATTEMPT_LOG_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("summary", help="totals, accuracy per skill/difficulty and the time-left histogram")
+    rs = sub.add_parser("rescore", help="practice scores per difficulty under other level weights")
+    rs.add_argument("--weights", default=json.dumps(MCQ_DIFFICULTY_WEIGHTS),
+                    help='JSON level -> multiplier, e.g. \'{"Beginner": 1.0, "Advanced": 2.0}\'')
+    args = ap.parse_args(argv)
+
+    log = AttemptLog(args.db)
+    if args.cmd == "rescore":
+        print(json.dumps(log.rescore(json.loads(args.weights)), indent=2))
+        return
+    print(json.dumps({
+        "totals": log.totals(),
+        "cells": log.accuracy_by_cell(),
+        "time_left": log.time_left_histogram(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Headless bulk resume screening.
+
+    python -m modules.bulk_screen resumes/ "more/*.pdf" --role "Data Scientist" --out results.csv
+    python -m modules.bulk_screen resumes/ --jd job.pdf --out results.jsonl --workers 8 --timeout 30 --resume
+
+Each PDF goes through extract_text -> extract_skills -> get_ats_score (role)
+or compare_resume_vs_jd (JD) in a process pool. Rows are written as soon as
+they finish, so an interrupted run can continue with --resume, which skips
+files already present in the output.
+"""
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, List, Optional, Set
+
+from config.roles import ROLE_SKILLS
+
+FIELDS = ["file", "status", "score", "n_skills", "skills", "matched", "missing", "seconds", "error"]
+
+
+def collect_pdfs(inputs: Iterable[str]) -> List[str]:
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files += glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True)
+        else:
+            files += glob.glob(item, recursive=True)
+    return sorted({os.path.abspath(f) for f in files if f.lower().endswith(".pdf")})
+
+
+def load_jd_skills(jd_path: str) -> List[str]:
+    from modules.resume_parser import read_pdf_text
+    from modules.jd_analyzer import extract_jd_skills
+    if jd_path.lower().endswith(".pdf"):
+        text = read_pdf_text(jd_path)
+    else:
+        with open(jd_path, encoding="utf-8", errors="ignore") as f:
+            text = f.read()
+    return extract_jd_skills(text)
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout()
+
+
+def _init_worker():
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+    # Load spaCy once per worker, outside any file's timeout budget
+    from modules.resume_parser import load_spacy
+    load_spacy()
+
+
+def screen_file(path: str, role: Optional[str], jd_skills: Optional[List[str]], timeout: float) -> Dict:
+    """Score one resume; per-file timeout is enforced with SIGALRM where available."""
+    from modules.resume_parser import read_pdf_text, extract_skills_batch
+    from modules.ats_scoring import get_ats_score
+    from modules.jd_analyzer import compare_resume_vs_jd
+
+    row = {"file": path, "status": "ok", "score": 0, "n_skills": 0, "skills": [],
+           "matched": [], "missing": [], "seconds": 0.0, "error": ""}
+    start = time.perf_counter()
+    use_alarm = timeout > 0 and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        text = read_pdf_text(path)
+        if not text.strip():
+            row["status"] = "empty"
+        skills = extract_skills_batch([text], n_process=1)[0]
+        if role:
+            score, matched, missing = get_ats_score(skills, role)
+        else:
+            matched, missing = compare_resume_vs_jd(skills, jd_skills or [])
+            score = int(len(matched) / max(1, len(jd_skills or [])) * 100)
+        row.update(score=score, n_skills=len(skills), skills=skills, matched=matched, missing=missing)
+    except _Timeout:
+        row.update(status="timeout", error=f"exceeded {timeout}s")
+    except Exception as e:
+        row.update(status="error", error=str(e))
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+class _Writer:
+    """Appends rows to CSV or JSONL, flushing each one."""
+
+    def __init__(self, path: str, append: bool):
+        self.jsonl = not path.lower().endswith(".csv")
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._f = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self._csv = None
+        if not self.jsonl:
+            self._csv = csv.DictWriter(self._f, fieldnames=FIELDS)
+            if not exists:
+                self._csv.writeheader()
+
+    def write(self, row: Dict):
+        if self.jsonl:
+            self._f.write(json.dumps(row) + "\n")
+        else:
+            self._csv.writerow({k: (";".join(v) if isinstance(v, list) else v) for k, v in row.items()})
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+def done_files(path: str) -> Set[str]:
+    """Files already recorded in an earlier (possibly interrupted) run's output."""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            done = {r["file"] for r in csv.DictReader(f) if r.get("file")}
+        else:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["file"])
+                except (ValueError, KeyError):
+                    continue  # truncated last line from an interrupted run
+    return done
+
+
+def run(files: List[str], out: str, role: Optional[str], jd_skills: Optional[List[str]],
+        workers: int, timeout: float, resume: bool) -> Dict[str, int]:
+    skip = done_files(out) if resume else set()
+    todo = [f for f in files if f not in skip]
+    writer = _Writer(out, append=resume)
+    counts = {"total": len(todo), "ok": 0, "empty": 0, "timeout": 0, "error": 0}
+    start = time.perf_counter()
+    pending = set()
+    it = iter(todo)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            while True:
+                # Bounded in-flight window keeps memory flat for very large batches.
+                while len(pending) < workers * 4:
+                    path = next(it, None)
+                    if path is None:
+                        break
+                    pending.add(pool.submit(screen_file, path, role, jd_skills, timeout))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    row = fut.result()
+                    writer.write(row)
+                    counts[row["status"]] += 1
+                done = sum(counts[k] for k in ("ok", "empty", "timeout", "error"))
+                rate = done / max(1e-9, time.perf_counter() - start)
+                print(f"\r[{done}/{len(todo)}] {rate:.1f} files/s", end="", file=sys.stderr, flush=True)
+    finally:
+        writer.close()
+        print(file=sys.stderr)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Screen many resume PDFs against a role or a job description.")
+    ap.add_argument("inputs", nargs="+", help="directories (searched recursively) or glob patterns of PDFs")
+    target = ap.add_mutually_exclusive_group(required=True)
+    target.add_argument("--role", choices=list(ROLE_SKILLS.keys()))
+    target.add_argument("--jd", help="job description file (.pdf or text)")
+    ap.add_argument("--out", required=True, help="output file; .csv for CSV, anything else for JSONL")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--timeout", type=float, default=60.0, help="per-file timeout in seconds (0 = none)")
+    ap.add_argument("--resume", action="store_true", help="skip files already present in --out and append")
+    args = ap.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    files = collect_pdfs(args.inputs)
+    if not files:
+        ap.error("no PDF files matched")
+    jd_skills = load_jd_skills(args.jd) if args.jd else None
+    if args.jd and not jd_skills:
+        ap.error("no known skills found in the job description")
+    counts = run(files, args.out, args.role, jd_skills, max(1, args.workers), args.timeout, args.resume)
+    print(json.dumps(counts), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
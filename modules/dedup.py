@@ -1,31 +1,219 @@
-def deduplicate_text_list(items):
+import re
+import zlib
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+from config.runtime import DEDUP_NEAR_THRESHOLD, DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE
+from modules.lazy import lazy_import
+from modules.skill_matcher import SKILL_MATCHER
+
+np = lazy_import("numpy")
+
+_PRIME = (1 << 31) - 1  # a * crc32 stays below 2**63, so hashing never overflows uint64
+_TRAILING_TAG = re.compile(r"\s*\([^()]*\)\s*$")
+_PUNCT = re.compile(r"[^a-z0-9+#]+")
+_NOT = re.compile(r"n['\u2019]t\b")
+
+# Function words carry no meaning for paraphrase matching:
+# "Describe a time you failed" == "Describe a time when you failed?"
+_STOPWORDS = frozenset(
+    "a an the is are was were be been being do does did have has had can could would should will shall"
+    " may might must of in on at to for from by with about as into over under between and or but if than"
+    " then so what which who whom whose when where why how this that these those it its i you your we our"
+    " they their he she his her me my us them there here some any".split()
+)
+# ...except the word a question opens with, which says what is asked:
+# "Why use indexes?" != "When should you not use indexes?". Negations are never stopwords.
+_QUESTION_WORDS = frozenset("what which who whom whose when where why how".split())
+
+
+def normalize_question(text: str) -> str:
+    """
+    Lowercase, drop a trailing "(...)" level tag such as "(Basics)" or
+    " (include metrics and trade-offs)", and collapse punctuation/whitespace.
+    """
+    text = _TRAILING_TAG.sub("", text.strip().lower())
+    return " ".join(_PUNCT.sub(" ", text).split())
+
+
+def _stem(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def shingles(text: str, k: int = DEDUP_SHINGLE_SIZE, skills: bool = True) -> Set[int]:
+    """
+    Hashed word k-grams, in order, of the question's content words
+    (stopwords dropped, plurals folded, a leading question word and
+    negations kept). skills=False also drops skill names, for indexes that
+    match topics separately: "What is a Python decorator?" and "What is a
+    decorator in Python?" then share their shingles.
+    """
+    words = normalize_question(_NOT.sub(" not", text.lower())).split()
+    if not skills:
+        words = normalize_question(SKILL_MATCHER.remove(" ".join(words))).split() or words
+    content = [_stem(w) for i, w in enumerate(words)
+               if w not in _STOPWORDS or (i == 0 and w in _QUESTION_WORDS)] or words
+    if len(content) <= k:
+        return {zlib.crc32(" ".join(content).encode("utf-8"))} if content else set()
+    return {zlib.crc32(" ".join(content[i:i + k]).encode("utf-8")) for i in range(len(content) - k + 1)}
+
+
+def question_topic(text: str) -> Tuple[str, ...]:
+    """Skills a question mentions; "Explain sql ..." is not a duplicate of "Explain python ..."."""
+    return tuple(SKILL_MATCHER.find(text))
+
+
+def _band_layout(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with the most rows per band whose LSH S-curve midpoint
+    (1/b)^(1/r) stays at or below 80% of the threshold, so pairs at the
+    threshold share a bucket ~99% of the time; candidates are verified anyway.
+    """
+    best = (num_perm, 1)
+    for r in range(1, num_perm + 1):
+        b = num_perm // r
+        if (1.0 / b) ** (1.0 / r) <= 0.8 * threshold:
+            best = (b, r)
+    return best
+
+
+class MinHashLSH:
+    """
+    Near-duplicate index over questions: MinHash signatures of word
+    shingles, bucketed by LSH bands. A lookup only compares against items
+    that share a band bucket, so checking one question against a bank of
+    100k costs about the same as against a bank of 100. Candidates are
+    confirmed with the exact Jaccard similarity of their shingle sets, since
+    questions are short and a 64-value signature estimate is too noisy near
+    the threshold.
+
+    `topic` (default: mentioned skills) must also match for two items to
+    count as duplicates, since templated questions that differ only in
+    the skill share most of their shingles. With a topic, skill names are
+    left out of the shingles, so where the skill sits in the question
+    does not matter.
+    """
+
+    def __init__(self, threshold: float = DEDUP_NEAR_THRESHOLD, num_perm: int = DEDUP_NUM_PERM,
+                 k: int = DEDUP_SHINGLE_SIZE, seed: int = 1,
+                 topic: Optional[Callable[[str], Hashable]] = question_topic):
+        rng = np.random.RandomState(seed)
+        self.threshold = threshold
+        self.topic = topic
+        self.num_perm = num_perm
+        self.k = k
+        self._a = rng.randint(1, _PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self.bands, self.rows = _band_layout(num_perm, threshold)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+        self._sets: Dict[Hashable, FrozenSet[int]] = {}
+        self._topics: Dict[Hashable, Hashable] = {}
+
+    def _shingles(self, text: str) -> Set[int]:
+        return shingles(text, self.k, skills=self.topic is None)
+
+    def signature(self, text: str, sh: Optional[Set[int]] = None) -> Optional["np.ndarray"]:
+        sh = self._shingles(text) if sh is None else sh
+        if not sh:
+            return None
+        x = np.fromiter(sh, dtype=np.uint64, count=len(sh))
+        return ((self._a * x + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig) -> List[bytes]:
+        r = self.rows
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def query(self, text: str, sig=None, sh: Optional[Set[int]] = None) -> List[Tuple[Hashable, float]]:
+        """Indexed keys whose Jaccard similarity to `text` reaches the threshold, best first."""
+        sh = self._shingles(text) if sh is None else sh
+        sig = self.signature(text, sh) if sig is None else sig
+        if sig is None:
+            return []
+        cands = {key for bucket, bk in zip(self._buckets, self._band_keys(sig)) for key in bucket.get(bk, ())}
+        if cands and self.topic is not None:
+            topic = self.topic(text)
+            cands = {c for c in cands if self._topics[c] == topic}
+        if not cands:
+            return []
+        hits = []
+        for c in cands:
+            other = self._sets[c]
+            sim = len(sh & other) / len(sh | other)
+            if sim >= self.threshold:
+                hits.append((c, sim))
+        return sorted(hits, key=lambda h: -h[1])
+
+    def is_near_duplicate(self, text: str) -> bool:
+        return bool(self.query(text))
+
+    def add(self, key: Hashable, text: str, sig=None, sh: Optional[Set[int]] = None) -> bool:
+        """Index `text` under `key`; False (nothing indexed) for text with no shingles."""
+        sh = self._shingles(text) if sh is None else sh
+        sig = self.signature(text, sh) if sig is None else sig
+        if sig is None:
+            return False
+        self._sets[key] = frozenset(sh)
+        self._topics[key] = self.topic(text) if self.topic is not None else None
+        for bucket, bk in zip(self._buckets, self._band_keys(sig)):
+            bucket.setdefault(bk, []).append(key)
+        return True
+
+    def add_if_new(self, key: Hashable, text: str) -> bool:
+        """
+        Index `text` unless it near-duplicates something already indexed.
+        False only for near-duplicates; text with no shingles is new but not indexed.
+        """
+        sh = self._shingles(text)
+        sig = self.signature(text, sh)
+        if sig is None:
+            return True
+        if self.query(text, sig=sig, sh=sh):
+            return False
+        return self.add(key, text, sig=sig, sh=sh)
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sets
+
+
+def deduplicate_text_list(items, near=False, threshold=DEDUP_NEAR_THRESHOLD):
     """
     Deduplicate a list of strings (HR questions, Tech questions).
-    Keeps the first occurrence of each question.
+    Keeps the first occurrence of each question. With near=True, paraphrases
+    and tag-only variants above `threshold` Jaccard similarity are dropped too.
     """
     seen = set()
     unique = []
+    index = MinHashLSH(threshold) if near else None
     for it in items:
         if not isinstance(it, str):
             continue
         q = it.strip().lower()
-        if q not in seen:
-            unique.append(it)
-            seen.add(q)
+        if q in seen:
+            continue
+        if index is not None and not index.add_if_new(len(unique), it):
+            continue
+        unique.append(it)
+        seen.add(q)
     return unique
 
 
-def deduplicate_mcq_list(mcqs):
+def deduplicate_mcq_list(mcqs, near=False, threshold=DEDUP_NEAR_THRESHOLD):
     """
     Deduplicate MCQ dictionaries based on the 'question' key.
+    near=True also drops near-duplicate questions (see deduplicate_text_list).
     """
     seen = set()
     unique = []
+    index = MinHashLSH(threshold) if near else None
     for m in mcqs:
         if not isinstance(m, dict) or "question" not in m:
             continue
         q = m["question"].strip().lower()
-        if q not in seen:
-            unique.append(m)
-            seen.add(q)
+        if q in seen:
+            continue
+        if index is not None and not index.add_if_new(len(unique), m["question"]):
+            continue
+        unique.append(m)
+        seen.add(q)
     return unique
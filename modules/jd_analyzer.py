@@ -1,8 +1,10 @@
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 import streamlit as st
-from modules.llm import generate_text
+from config.llm import LLM_MAX_INPUT_TOKENS
+from modules.llm import generate_text, generate_texts, stream_text, load_tokenizer
+from modules.dedup import deduplicate_text_list
 from modules.resume_parser import extract_text_from_pdf
-from config.roles import SKILL_KEYWORDS, ROLE_SKILLS
+from modules.skill_matcher import SKILL_MATCHER
 
 
 def extract_jd_text(uploaded_file, pasted_text: str) -> str:
@@ -12,12 +14,12 @@ def extract_jd_text(uploaded_file, pasted_text: str) -> str:
 
 
 def extract_jd_skills(jd_text: str) -> List[str]:
-    jd = (jd_text or "").lower()
-    found = set()
-    for kw in SKILL_KEYWORDS:
-        if f" {kw} " in f" {jd} ":
-            found.add(kw)
-    return sorted(found)
+    return SKILL_MATCHER.find(jd_text or "")
+
+
+def must_have_skills(summary: Dict) -> List[str]:
+    """Known skills named in a JD summary's must-have items (see jd_summary)."""
+    return SKILL_MATCHER.find(" ".join(summary.get("must_have", [])))
 
 
 def compare_resume_vs_jd(resume_skills: List[str], jd_skills: List[str]) -> Tuple[List[str], List[str]]:
@@ -26,13 +28,7 @@ def compare_resume_vs_jd(resume_skills: List[str], jd_skills: List[str]) -> Tupl
     return matched, missing
 
 
-def jd_summary(jd_text: str) -> Dict:
-    """
-    Use LLM to pull a clean summary (responsibilities, must-have, nice-to-have).
-    """
-    if not jd_text.strip():
-        return {"summary": "", "must_have": [], "nice_to_have": []}
-    prompt = f"""Summarize this job description. Provide:
+JD_SUMMARY_PROMPT = """Summarize this job description. Provide:
 1) A 3-sentence overview
 2) 5 must-have skills/requirements
 3) 5 nice-to-have skills
@@ -48,7 +44,9 @@ MUST:
 NICE:
 - <item> x5
 """
-    txt = generate_text(prompt, max_tokens=700, temperature=0.5)
+
+
+def parse_jd_summary(txt: str) -> Dict:
     overview = ""
     must, nice = [], []
     try:
@@ -69,3 +67,125 @@ NICE:
     except Exception:
         overview = txt.strip()
     return {"summary": overview, "must_have": must[:5], "nice_to_have": nice[:5]}
+
+
+JD_REDUCE_PROMPT = """Combine these partial summaries of one job description into a 3-sentence overview.
+
+{overviews}
+
+OVERVIEW:
+"""
+
+
+def _count_tokens(text: str, tokenizer) -> int:
+    if tokenizer is None:
+        return int(len(text.split()) * 1.3) + 1
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def _word_tokens(word: str, tokenizer) -> float:
+    if tokenizer is None:
+        return 1.3
+    return len(tokenizer.encode(word, add_special_tokens=False))
+
+
+def chunk_jd_text(jd_text: str, max_tokens: int = 0) -> List[str]:
+    """
+    Split a JD into line-aligned chunks that each fit the summary prompt's
+    token budget. Lines longer than the budget are split on words. Each
+    distinct word is tokenized once and counts are summed, so the cost is
+    linear in the length of the JD.
+    """
+    tokenizer = load_tokenizer()
+    if not max_tokens:
+        overhead = _count_tokens(JD_SUMMARY_PROMPT.format(jd_text=""), tokenizer)
+        max_tokens = max(64, LLM_MAX_INPUT_TOKENS - overhead - 8)
+
+    counts: Dict[str, float] = {}
+    pieces = []  # (text, tokens)
+    for line in jd_text.splitlines():
+        cur, cur_len = [], 0.0
+        for w in line.split():
+            n = counts.get(w)
+            if n is None:
+                n = counts[w] = _word_tokens(w, tokenizer)
+            if cur and cur_len + n > max_tokens:
+                pieces.append((" ".join(cur), cur_len))
+                cur, cur_len = [], 0.0
+            cur.append(w)
+            cur_len += n
+        if cur:
+            pieces.append((" ".join(cur), cur_len))
+
+    chunks, cur, cur_len = [], [], 0.0
+    for piece, n in pieces:
+        n += 1  # the joining newline
+        if cur and cur_len + n > max_tokens:
+            chunks.append("\n".join(cur))
+            cur, cur_len = [], 0.0
+        cur.append(piece)
+        cur_len += n
+    if cur:
+        chunks.append("\n".join(cur))
+    return chunks
+
+
+def _round_robin(lists: List[List[str]]) -> List[str]:
+    out = []
+    for i in range(max((len(l) for l in lists), default=0)):
+        out += [l[i] for l in lists if i < len(l)]
+    return out
+
+
+def merge_jd_summaries(parts: List[Dict]) -> Dict:
+    """
+    Merge per-chunk summaries. Items are interleaved across chunks so every
+    section of a long JD is represented, then deduplicated; anything already
+    listed as must-have is dropped from nice-to-have.
+    """
+    must = deduplicate_text_list(_round_robin([p["must_have"] for p in parts]))
+    must_keys = {m.strip().lower() for m in must}
+    nice = [
+        n for n in deduplicate_text_list(_round_robin([p["nice_to_have"] for p in parts]))
+        if n.strip().lower() not in must_keys
+    ]
+    overviews = [p["summary"] for p in parts if p["summary"]]
+    summary = " ".join(overviews)
+    if len(overviews) > 1:
+        reduced = generate_text(
+            JD_REDUCE_PROMPT.format(overviews="\n".join(f"- {o}" for o in overviews)),
+            max_tokens=300, temperature=0.5, deterministic=True,
+        ).strip()
+        summary = reduced or summary
+    return {"summary": summary, "must_have": must[:5], "nice_to_have": nice[:5]}
+
+
+def jd_summary(jd_text: str, chunks: Optional[List[str]] = None) -> Dict:
+    """
+    Use LLM to pull a clean summary (responsibilities, must-have, nice-to-have).
+    JDs longer than one prompt are summarized chunk by chunk (in one batch) and merged.
+    Pass `chunks` if chunk_jd_text(jd_text) was already computed. Decoding is
+    greedy, so the same JD always gets the same (cached) summary.
+    """
+    if not jd_text.strip():
+        return {"summary": "", "must_have": [], "nice_to_have": []}
+    if chunks is None:
+        chunks = chunk_jd_text(jd_text)
+    if len(chunks) <= 1:
+        txt = generate_text(JD_SUMMARY_PROMPT.format(jd_text=jd_text), max_tokens=700, temperature=0.5,
+                            deterministic=True)
+        return parse_jd_summary(txt)
+    txts = generate_texts([JD_SUMMARY_PROMPT.format(jd_text=c) for c in chunks], max_tokens=700, temperature=0.5,
+                          deterministic=True)
+    return merge_jd_summaries([parse_jd_summary(t) for t in txts])
+
+
+def stream_jd_summary(jd_text: str) -> Iterator[str]:
+    """
+    Yield the raw LLM summary as it is decoded; feed the joined text to parse_jd_summary.
+    Only for JDs that fit one prompt (see chunk_jd_text); longer ones go through jd_summary.
+    """
+    if not jd_text.strip():
+        return iter(())
+    return stream_text(JD_SUMMARY_PROMPT.format(jd_text=jd_text), max_tokens=700, temperature=0.5,
+                       deterministic=True)
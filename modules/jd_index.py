@@ -0,0 +1,184 @@
+"""
+Persistent inverted index of job descriptions for resume -> JD matching.
+
+Skills are extracted once per JD (extract_jd_skills) and stored as postings
+(skill -> JD ids) in SQLite, so "top-k JDs for this resume" only touches the
+postings of the resume's own skills.
+
+    python -m modules.jd_index add jds/*.txt jds/*.pdf
+    python -m modules.jd_index add --must python,sql,docker backend.pdf
+    python -m modules.jd_index query --resume resume.pdf -k 10 --require-must
+    python -m modules.jd_index remove <ref> ...
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+import streamlit as st
+from config.runtime import JD_INDEX_PATH
+from modules.jd_analyzer import extract_jd_skills, jd_summary, must_have_skills
+
+
+class JDIndex:
+    def __init__(self, path: str = JD_INDEX_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jds (
+                id INTEGER PRIMARY KEY, ref TEXT UNIQUE NOT NULL, title TEXT,
+                n_skills INTEGER NOT NULL, n_must INTEGER NOT NULL, added REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS postings (
+                skill TEXT NOT NULL, jd_id INTEGER NOT NULL, must INTEGER NOT NULL,
+                PRIMARY KEY (skill, jd_id)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_jd ON postings(jd_id);
+            """
+        )
+
+    @staticmethod
+    def ref_for(jd_text: str) -> str:
+        return hashlib.sha256(" ".join(jd_text.split()).encode("utf-8")).hexdigest()[:16]
+
+    def add(self, jd_text: str = "", ref: Optional[str] = None, title: str = "",
+            skills: Optional[List[str]] = None, must_have: Optional[Iterable[str]] = None) -> str:
+        """
+        Index (or re-index) one JD. `skills` defaults to extract_jd_skills(jd_text);
+        `must_have` marks the subset a resume has to cover for must-have filtering.
+        """
+        skills = sorted(set(skills if skills is not None else extract_jd_skills(jd_text)))
+        must = set(must_have or ()) & set(skills)
+        ref = ref or self.ref_for(jd_text)
+        with self._lock, self._conn:
+            self._remove(ref)
+            cur = self._conn.execute(
+                "INSERT INTO jds (ref, title, n_skills, n_must, added) VALUES (?, ?, ?, ?, ?)",
+                (ref, title, len(skills), len(must), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO postings (skill, jd_id, must) VALUES (?, ?, ?)",
+                [(s, cur.lastrowid, int(s in must)) for s in skills],
+            )
+        return ref
+
+    def _remove(self, ref: str) -> bool:
+        row = self._conn.execute("SELECT id FROM jds WHERE ref = ?", (ref,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM postings WHERE jd_id = ?", (row[0],))
+        self._conn.execute("DELETE FROM jds WHERE id = ?", (row[0],))
+        return True
+
+    def remove(self, ref: str) -> bool:
+        with self._lock, self._conn:
+            return self._remove(ref)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jds").fetchone()[0]
+
+    def query(self, resume_skills: List[str], k: int = 10, require_must: bool = False,
+              min_coverage: float = 0.0) -> List[Dict]:
+        """
+        Top-k JDs by coverage (share of the JD's skills the resume has).
+        `require_must` keeps only JDs whose must-have skills are all covered.
+        """
+        skills = sorted(set(resume_skills))
+        if not skills:
+            return []
+        marks = ",".join("?" * len(skills))
+        having = "HAVING must_hits = j.n_must" if require_must else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT j.id, j.ref, j.title, j.n_skills, COUNT(*) AS hits, SUM(p.must) AS must_hits,
+                       CAST(COUNT(*) AS REAL) / j.n_skills AS coverage
+                FROM postings p JOIN jds j ON j.id = p.jd_id
+                WHERE p.skill IN ({marks})
+                GROUP BY j.id {having}
+                ORDER BY coverage DESC, hits DESC, j.id
+                LIMIT ?
+                """,
+                (*skills, k),
+            ).fetchall()
+            out = []
+            for jd_id, ref, title, n_skills, hits, must_hits, coverage in rows:
+                if coverage < min_coverage:
+                    break
+                postings = self._conn.execute(
+                    "SELECT skill, must FROM postings WHERE jd_id = ? ORDER BY skill", (jd_id,)
+                ).fetchall()
+                have = set(skills)
+                out.append({
+                    "ref": ref,
+                    "title": title,
+                    "coverage": int(coverage * 100),
+                    "matched": [s for s, _ in postings if s in have],
+                    "missing": [s for s, _ in postings if s not in have],
+                    "must_missing": [s for s, m in postings if m and s not in have],
+                })
+        return out
+
+
+@st.cache_resource(show_spinner=False)
+def get_jd_index() -> JDIndex:
+    return JDIndex()
+
+
+def _read(path: str) -> str:
+    if path.lower().endswith(".pdf"):
+        from modules.resume_parser import read_pdf_text
+        return read_pdf_text(path)
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Maintain and query the job description index.")
+    ap.add_argument("--db", default=JD_INDEX_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    a = sub.add_parser("add", help="index JD files (.pdf or text); ref = file name")
+    a.add_argument("files", nargs="+")
+    a.add_argument("--must", help="comma-separated must-have skills for these JDs; by default they are taken"
+                                  " from the LLM summary of each JD, as in the app")
+    r = sub.add_parser("remove", help="remove JDs by ref")
+    r.add_argument("refs", nargs="+")
+    q = sub.add_parser("query", help="top-k JDs for a resume")
+    src = q.add_mutually_exclusive_group(required=True)
+    src.add_argument("--resume", help="resume PDF")
+    src.add_argument("--skills", help="comma-separated skills")
+    q.add_argument("-k", type=int, default=10)
+    q.add_argument("--require-must", action="store_true")
+    args = ap.parse_args(argv)
+
+    index = JDIndex(args.db)
+    if args.cmd == "add":
+        paths = sorted({p for pattern in args.files for p in glob.glob(pattern)})
+        fixed_must = [s.strip().lower() for s in args.must.split(",") if s.strip()] if args.must else None
+        for p in paths:
+            text = _read(p)
+            must = fixed_must if fixed_must is not None else must_have_skills(jd_summary(text))
+            index.add(text, ref=os.path.basename(p), title=os.path.splitext(os.path.basename(p))[0], must_have=must)
+        print(f"indexed {len(paths)} JDs ({len(index)} total)")
+    elif args.cmd == "remove":
+        removed = sum(index.remove(ref) for ref in args.refs)
+        print(f"removed {removed} JDs ({len(index)} total)")
+    else:
+        if args.resume:
+            from modules.resume_parser import extract_skills_batch
+            skills = extract_skills_batch([_read(args.resume)])[0]
+        else:
+            skills = [s.strip().lower() for s in args.skills.split(",") if s.strip()]
+        for row in index.query(skills, k=args.k, require_must=args.require_must):
+            print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import importlib
+import threading
+import time
+import types
+from typing import Dict, Iterable, Optional
+
+_T0 = time.perf_counter()
+_lock = threading.RLock()
+
+# module name -> seconds spent importing it (first use only)
+IMPORT_TIMES: Dict[str, float] = {}
+# milestone name -> seconds since this module was imported (~process start)
+MILESTONES: Dict[str, float] = {}
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a heavy module: the real import runs on first attribute
+    access and its duration is recorded in IMPORT_TIMES.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        mod = self.__dict__["_lazy_module"]
+        if mod is None:
+            with _lock:
+                mod = self.__dict__["_lazy_module"]
+                if mod is None:
+                    start = time.perf_counter()
+                    mod = importlib.import_module(self.__name__)
+                    IMPORT_TIMES[self.__name__] = round(time.perf_counter() - start, 3)
+                    self.__dict__["_lazy_module"] = mod
+        return mod
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def is_loaded(module: LazyModule) -> bool:
+    return module.__dict__.get("_lazy_module") is not None
+
+
+def mark(milestone: str):
+    """Record a startup milestone once (later calls keep the first timestamp)."""
+    with _lock:
+        MILESTONES.setdefault(milestone, round(time.perf_counter() - _T0, 3))
+
+
+def preload(loaders: Iterable, background: bool = True) -> Optional[threading.Thread]:
+    """
+    Run heavy loaders (LazyModules or callables such as model loaders),
+    by default on a daemon thread.
+    """
+    def _run():
+        for fn in loaders:
+            try:
+                fn._load() if isinstance(fn, LazyModule) else fn()
+            except Exception:
+                pass
+        mark("preload_done")
+
+    if not background:
+        _run()
+        return None
+    t = threading.Thread(target=_run, name="preload", daemon=True)
+    t.start()
+    return t
+
+
+def startup_report() -> Dict:
+    with _lock:
+        return {"milestones_s": dict(MILESTONES), "imports_s": dict(IMPORT_TIMES)}
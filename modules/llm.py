@@ -1,38 +1,447 @@
+import queue
+import random
+import threading
+import time
+from importlib.util import find_spec
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 import streamlit as st
+from config.llm import (
+    LLM_MODEL_NAME, LLM_BATCH_MAX_SIZE, LLM_BATCH_MAX_WAIT_MS, LLM_DETERMINISTIC,
+    LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS, LLM_CACHE_SAMPLE_SLOTS,
+    LLM_BACKEND, LLM_PARITY_CHECK, LLM_PARITY_THRESHOLD,
+)
+from modules.llm_cache import CompletionCache
+from modules.llm_backends import load_backend
+from modules.lazy import lazy_import
+from modules import model_client
+from modules.ai_utils import count_complete_bullets, count_complete_mcqs
+from config.runtime import MODEL_SERVER_FALLBACK
 
-USE_LLM = False
-try:
-    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-    import torch  # noqa: F401
-    USE_LLM = True
-except Exception:
-    USE_LLM = False
+# transformers/torch are only imported when the model is first loaded
+USE_LLM = find_spec("transformers") is not None and find_spec("torch") is not None
+transformers = lazy_import("transformers")
+torch = lazy_import("torch")
+
+# Filled in by load_llm(): backend actually in use, parity score, warmup time.
+BACKEND_INFO = {}
 
 @st.cache_resource(show_spinner=False)
 def load_llm():
     if not USE_LLM:
         return None, None
     try:
-        model_name = "google/flan-t5-base"
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        tokenizer, model, info = load_backend(
+            LLM_BACKEND, LLM_MODEL_NAME,
+            parity_check=LLM_PARITY_CHECK, parity_threshold=LLM_PARITY_THRESHOLD,
+        )
+        BACKEND_INFO.update(info)
         return tokenizer, model
     except Exception:
         return None, None
 
 
-def generate_text(prompt: str, max_tokens: int = 512, temperature: float = 0.9) -> str:
+@st.cache_resource(show_spinner=False)
+def load_tokenizer():
+    """Tokenizer only (for token counting); doesn't load model weights."""
+    if not USE_LLM:
+        return None
+    try:
+        return transformers.AutoTokenizer.from_pretrained(LLM_MODEL_NAME)
+    except Exception:
+        return None
+
+
+def llm_available() -> bool:
+    """True if completions can be produced, via the model server or an in-process model."""
+    if model_client.remote_enabled() and model_client.health() is not None:
+        return True
+    if model_client.remote_enabled() and not MODEL_SERVER_FALLBACK:
+        return False
+    return load_llm()[0] is not None
+
+
+def _remote_generate(prompts: List[str], **kwargs) -> Optional[List[str]]:
+    resp = model_client.call("/generate", dict(prompts=prompts, **kwargs))
+    return resp.get("texts") if resp else None
+
+
+@st.cache_resource(show_spinner=False)
+def get_cache() -> Optional[CompletionCache]:
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        return CompletionCache(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+    except Exception:
+        return None
+
+
+class Stop(NamedTuple):
+    """
+    Early-stopping conditions shared by a batch (part of the batching key).
+    Output is cut at the first of `strings`; `kind` ("bullets" or "mcqs")
+    is what each row's own item limit counts.
+    """
+    strings: Tuple[str, ...] = ()
+    kind: str = ""
+
+
+NO_STOP = Stop()
+
+_ITEM_COUNTERS = {"bullets": count_complete_bullets, "mcqs": count_complete_mcqs}
+
+ItemLimit = Union[int, Sequence[int]]
+
+
+def _make_stop(stop: Union[str, Sequence[str], None], item_kind: str) -> Stop:
+    if isinstance(stop, str):
+        stop = (stop,)
+    if item_kind and item_kind not in _ITEM_COUNTERS:
+        raise ValueError(f"unknown item_kind: {item_kind!r}")
+    return Stop(tuple(s for s in (stop or ()) if s), item_kind)
+
+
+def _item_limits(max_items: ItemLimit, n: int) -> List[int]:
+    return [max_items] * n if isinstance(max_items, int) else list(max_items)
+
+
+def truncate_at_stop(text: str, strings: Sequence[str]) -> str:
+    cuts = [i for i in (text.find(s) for s in strings) if i >= 0]
+    return text[:min(cuts)] if cuts else text
+
+
+def _decoding_params(max_tokens: int, temperature: float, deterministic: Optional[bool], stop: Stop = NO_STOP) -> Tuple:
+    do_sample = not (LLM_DETERMINISTIC if deterministic is None else deterministic)
+    return max_tokens, (temperature if do_sample else 0.0), do_sample, stop
+
+
+def _completion_cache(use_cache: bool, params: Tuple) -> Optional[CompletionCache]:
+    """The cache for this call; None for sampled calls when LLM_CACHE_SAMPLE_SLOTS is 0."""
+    if not use_cache or (params[2] and LLM_CACHE_SAMPLE_SLOTS <= 0):
+        return None
+    return get_cache()
+
+
+def _cache_key(prompt: str, params: Tuple, max_items: int = 0) -> str:
+    max_tokens, temperature, do_sample, stop = params
+    extra = {"stop": list(stop), "max_items": max_items} if stop != NO_STOP else {}
+    if do_sample:
+        extra["slot"] = random.randrange(LLM_CACHE_SAMPLE_SLOTS)
+    return CompletionCache.make_key(
+        prompt, f"{LLM_MODEL_NAME}:{LLM_BACKEND}", max_length=max_tokens, temperature=temperature,
+        do_sample=do_sample, **extra
+    )
+
+
+def _generate_kwargs(max_tokens: int, temperature: float, do_sample: bool) -> dict:
+    sampling = dict(top_p=0.95, top_k=40, temperature=temperature) if do_sample else {}
+    return dict(max_length=max_tokens, do_sample=do_sample, **sampling)
+
+
+def _stopping_criteria(tokenizer, stop: Stop, deadlines: Sequence[Optional[float]],
+                       max_items: Sequence[int], prompt_len: int = 0):
+    """
+    A transformers StoppingCriteria that finishes each row of a batch on
+    its own: at its monotonic deadline, or once its decoded text contains
+    a stop string or max_items[i] complete items. `timed_out[i]` records
+    rows that were cut short by their deadline.
+    """
+    count_items = _ITEM_COUNTERS.get(stop.kind)
+
+    class _Criteria(transformers.StoppingCriteria):
+        def __init__(self):
+            self.finished = [False] * len(deadlines)
+            self.timed_out = [False] * len(deadlines)
+
+        def __call__(self, input_ids, scores, **kwargs):
+            now = time.monotonic()
+            active = [i for i, f in enumerate(self.finished) if not f]
+            for i in active:
+                if deadlines[i] is not None and now >= deadlines[i]:
+                    self.finished[i] = self.timed_out[i] = True
+            active = [i for i in active if not self.finished[i]]
+            if active and (stop.strings or count_items):
+                texts = tokenizer.batch_decode(input_ids[active, prompt_len:], skip_special_tokens=True)
+                for i, text in zip(active, texts):
+                    if any(s in text for s in stop.strings) or (
+                        count_items and max_items[i] > 0 and count_items(text) >= max_items[i]
+                    ):
+                        self.finished[i] = True
+            return torch.tensor(self.finished, dtype=torch.bool, device=input_ids.device)
+
+    return _Criteria()
+
+
+def _needs_criteria(stop: Stop, deadlines: Sequence[Optional[float]], max_items: Sequence[int]) -> bool:
+    return bool(stop.strings) or (bool(stop.kind) and any(max_items)) or any(d is not None for d in deadlines)
+
+
+def _generate_batch(prompts: List[str], max_tokens: int, temperature: float, do_sample: bool = True,
+                    stop: Stop = NO_STOP, deadlines: Optional[Sequence[Optional[float]]] = None,
+                    max_items: Optional[Sequence[int]] = None) -> List[Tuple[str, bool]]:
+    """
+    (text, timed_out) per prompt. `deadlines` (time.monotonic() limits) and
+    `max_items` apply per prompt.
+    """
+    tokenizer, model = load_llm()
+    deadlines = list(deadlines or [None] * len(prompts))
+    max_items = list(max_items or [0] * len(prompts))
+    inputs = tokenizer(prompts, return_tensors="pt", padding=True)
+    kwargs = _generate_kwargs(max_tokens, temperature, do_sample)
+    criteria = None
+    if _needs_criteria(stop, deadlines, max_items):
+        prompt_len = 0 if getattr(model.config, "is_encoder_decoder", True) else inputs["input_ids"].shape[1]
+        criteria = _stopping_criteria(tokenizer, stop, deadlines, max_items, prompt_len)
+        kwargs["stopping_criteria"] = transformers.StoppingCriteriaList([criteria])
+    output = model.generate(**inputs, **kwargs)
+    texts = [truncate_at_stop(t, stop.strings) for t in tokenizer.batch_decode(output, skip_special_tokens=True)]
+    return list(zip(texts, criteria.timed_out if criteria else [False] * len(texts)))
+
+
+class _Request:
+    __slots__ = ("prompt", "params", "deadline", "max_items", "done", "result", "timed_out", "error")
+
+    def __init__(self, prompt: str, params: Tuple, deadline: Optional[float] = None, max_items: int = 0):
+        self.prompt = prompt
+        self.params = params
+        self.deadline = deadline
+        self.max_items = max_items
+        self.done = threading.Event()
+        self.result = ""
+        self.timed_out = False
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent generation requests for up to `max_wait_ms` and runs
+    those sharing decoding parameters through a single padded generate call.
+    """
+
+    def __init__(self, max_batch_size: int = LLM_BATCH_MAX_SIZE, max_wait_ms: int = LLM_BATCH_MAX_WAIT_MS):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._held = []  # requests whose params did not match the batch being built
+        self._thread = threading.Thread(target=self._loop, name="llm-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, prompts: List[str], params: Tuple, deadline: Optional[float] = None,
+               max_items: Optional[Sequence[int]] = None) -> List[Tuple[str, bool]]:
+        """(text, timed_out) per prompt, once its batch has run."""
+        reqs = [_Request(p, params, deadline, k) for p, k in zip(prompts, max_items or [0] * len(prompts))]
+        for r in reqs:
+            self._queue.put(r)
+        for r in reqs:
+            r.done.wait()
+        for r in reqs:
+            if r.error is not None:
+                raise r.error
+        return [(r.result, r.timed_out) for r in reqs]
+
+    def pending(self) -> int:
+        return self._queue.qsize() + len(self._held)
+
+    def _next_batch(self) -> List[_Request]:
+        first = self._held.pop(0) if self._held else self._queue.get()
+        batch = [first]
+        for r in [r for r in self._held if r.params == first.params][: self.max_batch_size - 1]:
+            self._held.remove(r)
+            batch.append(r)
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                r = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if r.params == first.params:
+                batch.append(r)
+            else:
+                self._held.append(r)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = _generate_batch([r.prompt for r in batch], *batch[0].params,
+                                          deadlines=[r.deadline for r in batch],
+                                          max_items=[r.max_items for r in batch])
+                for r, (text, timed_out) in zip(batch, results):
+                    r.result, r.timed_out = text, timed_out
+            except Exception as e:
+                for r in batch:
+                    r.error = e
+            for r in batch:
+                r.done.set()
+
+
+@st.cache_resource(show_spinner=False)
+def get_batcher() -> MicroBatcher:
+    return MicroBatcher()
+
+
+def generate_texts(
+    prompts: List[str],
+    max_tokens: int = 512,
+    temperature: float = 0.9,
+    deterministic: Optional[bool] = None,
+    use_cache: bool = True,
+    stop: Union[str, Sequence[str], None] = None,
+    max_items: ItemLimit = 0,
+    item_kind: str = "",
+    max_time: float = 0.0,
+) -> List[str]:
+    """
+    Generate one completion per prompt. Cached completions are returned
+    directly; the rest are queued together so they share a batch with each
+    other and with concurrent callers. With MODEL_SERVER_URL set, the shared
+    model server does all of this and the local model is only a fallback.
+
+    Decoding ends early at any of the `stop` strings (excluded from the
+    output), once `max_items` (one limit, or one per prompt) complete
+    "bullets" or "mcqs" (`item_kind`) exist, or when `max_time` seconds
+    have passed since the call; in the last case the partial output is
+    returned and not cached.
+    """
+    deadline = time.monotonic() + max_time if max_time > 0 else None
+    stop_spec = _make_stop(stop, item_kind)
+    limits = _item_limits(max_items, len(prompts))
+    if prompts and model_client.remote_enabled():
+        texts = _remote_generate(prompts, max_tokens=max_tokens, temperature=temperature,
+                                 deterministic=deterministic, use_cache=use_cache,
+                                 stop=list(stop_spec.strings), max_items=limits, item_kind=item_kind,
+                                 max_time=max_time)
+        if texts is not None:
+            return texts
+        if not MODEL_SERVER_FALLBACK:
+            return [""] * len(prompts)
+    tok_mod = load_llm()
+    if not prompts or not tok_mod or tok_mod[0] is None:
+        return [""] * len(prompts)
+    params = _decoding_params(max_tokens, temperature, deterministic, stop_spec)
+    cache = _completion_cache(use_cache, params)
+    results: List[Optional[str]] = [None] * len(prompts)
+    keys = []
+    if cache is not None:
+        keys = [_cache_key(p, params, k) for p, k in zip(prompts, limits)]
+        results = [cache.get(k) for k in keys]
+
+    todo = [i for i, r in enumerate(results) if r is None]
+    if todo:
+        todo_prompts = [prompts[i] for i in todo]
+        todo_limits = [limits[i] for i in todo]
+        if LLM_BATCH_MAX_SIZE <= 1:
+            fresh = [_generate_batch([p], *params, deadlines=[deadline], max_items=[k])[0]
+                     for p, k in zip(todo_prompts, todo_limits)]
+        else:
+            fresh = get_batcher().submit(todo_prompts, params, deadline, todo_limits)
+        for i, (text, timed_out) in zip(todo, fresh):
+            results[i] = text
+            if cache is not None and text and not timed_out:
+                cache.put(keys[i], text)
+    return results
+
+
+def generate_text(
+    prompt: str,
+    max_tokens: int = 512,
+    temperature: float = 0.9,
+    deterministic: Optional[bool] = None,
+    use_cache: bool = True,
+    stop: Union[str, Sequence[str], None] = None,
+    max_items: ItemLimit = 0,
+    item_kind: str = "",
+    max_time: float = 0.0,
+) -> str:
+    return generate_texts(
+        [prompt], max_tokens=max_tokens, temperature=temperature,
+        deterministic=deterministic, use_cache=use_cache,
+        stop=stop, max_items=max_items, item_kind=item_kind, max_time=max_time,
+    )[0]
+
+
+def stream_text(
+    prompt: str,
+    max_tokens: int = 512,
+    temperature: float = 0.9,
+    deterministic: Optional[bool] = None,
+    use_cache: bool = True,
+    stop: Union[str, Sequence[str], None] = None,
+    max_items: int = 0,
+    item_kind: str = "",
+    max_time: float = 0.0,
+) -> Iterator[str]:
+    """
+    Yield the completion for `prompt` piece by piece as it is decoded.
+    A cached completion is yielded in one piece, as is a model-server
+    completion (the server protocol is not streaming). Stop conditions
+    work as in generate_texts.
+    """
+    deadline = time.monotonic() + max_time if max_time > 0 else None
+    stop_spec = _make_stop(stop, item_kind)
+    if model_client.remote_enabled():
+        texts = _remote_generate([prompt], max_tokens=max_tokens, temperature=temperature,
+                                 deterministic=deterministic, use_cache=use_cache,
+                                 stop=list(stop_spec.strings), max_items=[max_items], item_kind=item_kind,
+                                 max_time=max_time)
+        if texts is not None:
+            yield texts[0]
+            return
+        if not MODEL_SERVER_FALLBACK:
+            return
     tok_mod = load_llm()
     if not tok_mod or tok_mod[0] is None:
-        return ""
+        return
     tokenizer, model = tok_mod
+    params = _decoding_params(max_tokens, temperature, deterministic, stop_spec)
+    cache = _completion_cache(use_cache, params)
+    key = _cache_key(prompt, params, max_items) if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        yield cached
+        return
+
+    streamer = transformers.TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
     inputs = tokenizer(prompt, return_tensors="pt")
-    output = model.generate(
-        **inputs,
-        max_length=max_tokens,
-        do_sample=True,
-        top_p=0.95,
-        top_k=40,
-        temperature=temperature,
-    )
-    return tokenizer.decode(output[0], skip_special_tokens=True)
+
+    kwargs = _generate_kwargs(*params[:3])
+    criteria = None
+    if _needs_criteria(stop_spec, [deadline], [max_items]):
+        prompt_len = 0 if getattr(model.config, "is_encoder_decoder", True) else inputs["input_ids"].shape[1]
+        criteria = _stopping_criteria(tokenizer, stop_spec, [deadline], [max_items], prompt_len)
+        kwargs["stopping_criteria"] = transformers.StoppingCriteriaList([criteria])
+
+    failed = threading.Event()
+
+    def _run():
+        try:
+            model.generate(**inputs, streamer=streamer, **kwargs)
+        except Exception:
+            failed.set()
+            streamer.end()
+
+    worker = threading.Thread(target=_run, name="llm-stream", daemon=True)
+    worker.start()
+    # Hold back enough characters that a stop string split across pieces is never emitted
+    hold = max((len(s) for s in stop_spec.strings), default=1) - 1
+    text, sent, stopped = "", 0, False
+    for piece in streamer:
+        if stopped:
+            continue  # drain until generation notices the stop string
+        text += piece
+        cut = truncate_at_stop(text, stop_spec.strings)
+        stopped = len(cut) < len(text)
+        upto = len(cut) if stopped else max(sent, len(text) - hold)
+        if upto > sent:
+            yield text[sent:upto]
+            sent = upto
+    worker.join()
+    text = truncate_at_stop(text, stop_spec.strings)
+    if len(text) > sent:
+        yield text[sent:]
+    timed_out = criteria is not None and criteria.timed_out[0]
+    if cache is not None and text and not failed.is_set() and not timed_out:
+        cache.put(key, text)
@@ -0,0 +1,88 @@
+import difflib
+import time
+from typing import Dict, List, Tuple
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+# Fixed prompts used to warm up a backend and compare it against fp32.
+PARITY_PROMPTS: List[str] = [
+    "Generate 3 Beginner HR interview questions for a Python Developer.",
+    "Explain what a REST API is in one sentence.",
+    "List 3 skills required for a DevOps Engineer.",
+]
+
+
+def load_torch(model_name: str):
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    return tokenizer, model
+
+
+def load_torch_int8(model_name: str):
+    import torch
+    tokenizer, model = load_torch(model_name)
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return tokenizer, model
+
+
+def load_onnx(model_name: str):
+    from transformers import AutoTokenizer
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+    return tokenizer, model
+
+
+_LOADERS = {"torch": load_torch, "torch-int8": load_torch_int8, "onnx": load_onnx}
+
+
+def greedy_outputs(tokenizer, model, prompts: List[str], max_tokens: int = 64) -> List[str]:
+    inputs = tokenizer(prompts, return_tensors="pt", padding=True)
+    output = model.generate(**inputs, max_length=max_tokens, do_sample=False)
+    return tokenizer.batch_decode(output, skip_special_tokens=True)
+
+
+def parity_score(candidate: List[str], reference: List[str]) -> float:
+    """Mean character-level similarity (0..1) between two lists of outputs."""
+    if not reference:
+        return 1.0
+    ratios = [difflib.SequenceMatcher(None, c, r).ratio() for c, r in zip(candidate, reference)]
+    return sum(ratios) / len(reference)
+
+
+def load_backend(
+    name: str, model_name: str, parity_check: bool = True, parity_threshold: float = 0.8
+) -> Tuple[object, object, Dict]:
+    """
+    Load `model_name` on the requested backend, warm it up on PARITY_PROMPTS and,
+    for non-fp32 backends, compare its greedy outputs against fp32.
+    Falls back to fp32 torch if the backend is unavailable or below `parity_threshold`.
+    """
+    info = {"requested": name, "backend": name, "parity": None, "warmup_s": None, "error": ""}
+    if name not in _LOADERS:
+        info["error"] = f"unknown backend {name!r}, expected one of {BACKENDS}"
+        name = info["backend"] = "torch"
+    try:
+        tokenizer, model = _LOADERS[name](model_name)
+    except Exception as e:
+        if name == "torch":
+            raise
+        info["error"] = f"{name} backend unavailable: {e}"
+        name = info["backend"] = "torch"
+        tokenizer, model = load_torch(model_name)
+
+    start = time.perf_counter()
+    outputs = greedy_outputs(tokenizer, model, PARITY_PROMPTS)
+    info["warmup_s"] = round(time.perf_counter() - start, 3)
+
+    if name != "torch" and parity_check:
+        ref_tokenizer, ref_model = load_torch(model_name)
+        reference = greedy_outputs(ref_tokenizer, ref_model, PARITY_PROMPTS)
+        info["parity"] = round(parity_score(outputs, reference), 3)
+        if info["parity"] < parity_threshold:
+            info["error"] = f"{name} parity {info['parity']} below {parity_threshold}; using fp32"
+            info["backend"] = "torch"
+            tokenizer, model = ref_tokenizer, ref_model
+    return tokenizer, model, info
@@ -1,12 +1,17 @@
-from typing import List, Dict
-from modules.llm import generate_text
-from modules.ai_utils import parse_ai_mcq_block
+import random
+from collections import OrderedDict
+from typing import Iterator, List, Dict, Optional, Tuple
+from config.roles import ROLE_SKILLS
+from config.llm import LLM_BATCH_MAX_SIZE, LLM_INTERACTIVE_MAX_TIME_S
+from modules.llm import generate_texts, stream_text
+from modules.ai_utils import parse_ai_mcq_block, iter_ai_mcqs
 from modules.mcq_generator import generate_mcqs as fallback_mcqs
-from modules.dedup import deduplicate_mcq_list
+from modules.dedup import deduplicate_mcq_list, MinHashLSH
+from modules.pregen import take_from_pool
+from modules.mcq_corpus import get_mcq_corpus
 
 TEMPLATE = """
-Generate {n} MCQs for the topic: {skill}.
-Difficulty mix: 30% Easy, 50% Intermediate, 20% Advanced.
+Generate {n} {difficulty} MCQs for the topic: {skill}.
 Format:
 
 Q: <question>
@@ -20,21 +25,175 @@ Explanation: <why>
 Separate questions using lines of ---.
 """
 
+DIFFICULTY_LABELS = {"easy": "Easy", "intermediate": "Intermediate", "advanced": "Advanced"}
 
-def generate_ai_mcqs(role: str, skills: List[str], n: int, level: str) -> List[Dict]:
-    skill = (skills[0] if skills else None) or "python"
+# Small per-skill requests decode quickly and reliably; many run as one batch.
+MCQS_PER_REQUEST = 5
+TOKENS_PER_MCQ = 160
 
-    txt = generate_text(TEMPLATE.format(n=n, skill=skill), max_tokens=2400, temperature=0.92)
-    mcqs = parse_ai_mcq_block(txt)
 
-    # ✅ Deduplicate AI output
-    mcqs = deduplicate_mcq_list(mcqs)
+def difficulty_counts(n: int) -> Dict[str, int]:
+    """30% easy / 50% intermediate / 20% advanced, same rounding as generate_mcqs."""
+    if n < 3:
+        return {k: c for k, c in zip(("intermediate", "easy"), (n - n // 2, n // 2)) if c}
+    n_easy = max(1, int(n * 0.30))
+    n_mid = max(1, int(n * 0.50))
+    return {"easy": n_easy, "intermediate": n_mid, "advanced": max(1, n - n_easy - n_mid)}
+
+
+def mcq_topics(role: str, skills: List[str]) -> List[str]:
+    """Detected skills first, then the role's skills, without repeats."""
+    topics = list(OrderedDict.fromkeys([s for s in (skills or []) + ROLE_SKILLS.get(role, []) if s]))
+    return topics or ["python"]
+
+
+def allocate_mcqs(topics: List[str], n: int) -> Dict[str, Dict[str, int]]:
+    """
+    Spread n questions evenly over topics. Difficulty slots are interleaved
+    (E, I, A, I, E, ...) before being dealt round-robin, so every topic
+    gets a share of the mix rather than a single difficulty.
+    """
+    slots = sorted(
+        ((i + 0.5) / c, d) for d, c in difficulty_counts(n).items() for i in range(c)
+    )
+    slots = [d for _, d in slots]
+    plan: Dict[str, Dict[str, int]] = OrderedDict()
+    for i, diff in enumerate(slots):
+        counts = plan.setdefault(topics[i % len(topics)], {})
+        counts[diff] = counts.get(diff, 0) + 1
+    return plan
+
+
+def _split_requests(requests: List[Tuple[str, str, int]]) -> List[Tuple[str, str, int]]:
+    chunks = []
+    for skill, diff, count in requests:
+        while count > 0:
+            k = min(count, MCQS_PER_REQUEST)
+            chunks.append((skill, diff, k))
+            count -= k
+    return chunks
+
+
+def _prompt(skill: str, diff: str, k: int) -> str:
+    return TEMPLATE.format(n=k, difficulty=DIFFICULTY_LABELS[diff], skill=skill)
+
+
+MAX_TOKENS = MCQS_PER_REQUEST * TOKENS_PER_MCQ + 64
+
+
+def generate_skill_mcqs(requests: List[Tuple[str, str, int]], use_cache: bool = True,
+                        max_time: float = 0.0) -> List[Dict]:
+    """
+    Run (skill, difficulty, count) requests as one batch of small generations,
+    split into chunks of at most MCQS_PER_REQUEST. Each generation stops once
+    its chunk's MCQs are complete (or after max_time seconds). Items are
+    tagged with their difficulty and skill.
+    """
+    chunks = _split_requests(requests)
+    if not chunks:
+        return []
+    prompts = [_prompt(*c) for c in chunks]
+    txts = generate_texts(prompts, max_tokens=MAX_TOKENS, temperature=0.92, use_cache=use_cache,
+                          max_items=[k for _, _, k in chunks], item_kind="mcqs", max_time=max_time)
+    out = []
+    for (skill, diff, k), txt in zip(chunks, txts):
+        for m in parse_ai_mcq_block(txt)[:k]:
+            m["difficulty"] = diff
+            m["skill"] = skill
+            out.append(m)
+    return out
+
+
+def stream_skill_mcqs(requests: List[Tuple[str, str, int]]) -> Iterator[Dict]:
+    """
+    generate_skill_mcqs, but yielding as it goes: the first chunk is
+    streamed and each MCQ is emitted as soon as its block is complete;
+    the remaining chunks run in batches of LLM_BATCH_MAX_SIZE.
+    """
+    chunks = _split_requests(requests)
+    if not chunks:
+        return
+    skill, diff, k = chunks[0]
+    # Read the stream to the end (extra MCQs are dropped) so the completion still gets cached
+    stream = stream_text(_prompt(skill, diff, k), max_tokens=MAX_TOKENS, temperature=0.92,
+                         max_items=k, item_kind="mcqs", max_time=LLM_INTERACTIVE_MAX_TIME_S)
+    for i, m in enumerate(iter_ai_mcqs(stream)):
+        if i < k:
+            m["difficulty"] = diff
+            m["skill"] = skill
+            yield m
+    rest = chunks[1:]
+    step = max(1, LLM_BATCH_MAX_SIZE)
+    for i in range(0, len(rest), step):
+        yield from generate_skill_mcqs(rest[i:i + step], max_time=LLM_INTERACTIVE_MAX_TIME_S)
+
+
+def _ready_and_requests(role: str, skills: List[str], n: int) -> Tuple[List[Dict], List[Tuple[str, str, int]]]:
+    """
+    MCQs available right away (offline corpus first, then pre-generated
+    pools) and the (skill, difficulty, count) shortfall to generate live.
+    """
+    plan = allocate_mcqs(mcq_topics(role, skills), n)
+    corpus = get_mcq_corpus()
+    mcqs, requests = [], []
+    for skill, counts in plan.items():
+        counts = dict(counts)
+        if corpus is not None:
+            for d in list(counts):
+                got = corpus.sample(skill, d, counts[d])
+                counts[d] -= len(got)
+                mcqs += got
+            counts = {d: c for d, c in counts.items() if c > 0}
+            if not counts:
+                continue
+        for m in take_from_pool("mcq", skill, "", sum(counts.values())):
+            diff = m.get("difficulty") if counts.get(m.get("difficulty"), 0) > 0 else max(counts, key=counts.get)
+            counts[diff] -= 1
+            mcqs.append(m)
+        requests += [(skill, d, c) for d, c in counts.items() if c > 0]
+    return mcqs, requests
+
+
+def generate_ai_mcqs(role: str, skills: List[str], n: int, level: str, user: Optional[str] = None) -> List[Dict]:
+    # ✅ Offline corpus and pre-generated pools first; only the shortfall is generated live
+    mcqs, requests = _ready_and_requests(role, skills, n)
+    mcqs += generate_skill_mcqs(requests, max_time=LLM_INTERACTIVE_MAX_TIME_S)
+
+    # ✅ Deduplicate AI output (paraphrased questions included)
+    mcqs = deduplicate_mcq_list(mcqs, near=True)
+    random.shuffle(mcqs)
 
     # ✅ Not enough? → Fill using fallback (also deduped)
     if len(mcqs) < n:
-        extra = fallback_mcqs(role, skills, n - len(mcqs), level)
+        extra = fallback_mcqs(role, skills, n - len(mcqs), level, user=user)
         extra = deduplicate_mcq_list(extra)
-        combined = deduplicate_mcq_list(mcqs + extra)
+        combined = deduplicate_mcq_list(mcqs + extra, near=True)
         return combined[:n]
 
     return mcqs[:n]
+
+
+def stream_ai_mcqs(role: str, skills: List[str], n: int, level: str, user: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield up to n MCQs as they become available: ready ones (shuffled) at
+    once, then live ones as they are parsed, then the non-AI fallback for
+    any shortfall. Near-duplicates are filtered incrementally.
+    """
+    index = MinHashLSH()
+    sent = 0
+
+    def fresh(items):
+        nonlocal sent
+        for m in items:
+            if sent >= n:
+                return
+            if index.add_if_new(sent, m["question"]):
+                sent += 1
+                yield m
+
+    ready, requests = _ready_and_requests(role, skills, n)
+    random.shuffle(ready)
+    yield from fresh(ready)
+    yield from fresh(stream_skill_mcqs(requests))
+    if sent < n:
+        yield from fresh(fallback_mcqs(role, skills, n - sent, level, user=user))
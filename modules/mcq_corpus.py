@@ -0,0 +1,279 @@
+"""
+Offline AI-generated MCQ corpus.
+
+    python -m modules.mcq_corpus build --workers 2 --per-cell 30
+    python -m modules.mcq_corpus info
+
+`build` sweeps SKILL_KEYWORDS x difficulty through generate_skill_mcqs in a
+process pool, keeps only well-formed MCQs, deduplicates them and writes one
+compact binary file. Each finished skill is saved as a shard first, so an
+interrupted build picks up where it stopped. The app memory-maps the file
+and decodes only the records it serves.
+
+File layout (little-endian):
+    header   "MCQC", format version u16, n_cells u32, n_records u32,
+             built-at f64, model name (u16 length + utf-8)
+    cells    per cell: skill (u16 length + utf-8), difficulty code u8,
+             first record u32, record count u32
+    offsets  (n_records + 1) x u64, relative to the start of the records
+    records  answer index u8, six u16 lengths, then question, four
+             options and explanation as utf-8
+"""
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+import streamlit as st
+from config.llm import LLM_MODEL_NAME, MCQ_CORPUS_PATH, MCQ_CORPUS_PER_CELL
+from config.roles import SKILL_KEYWORDS
+
+MAGIC = b"MCQC"
+FORMAT_VERSION = 1
+DIFFICULTIES = ("easy", "intermediate", "advanced")
+
+_HEADER = struct.Struct("<4sHIId")
+_CELL = struct.Struct("<BII")
+_RECORD = struct.Struct("<B6H")
+_LEN = struct.Struct("<H")
+
+Cell = Tuple[str, str]  # (skill, difficulty)
+
+
+def valid_mcq(m: Dict) -> bool:
+    """Stricter than parse_ai_mcq_block: a real question and four distinct, non-empty options."""
+    opts = [o.strip().lower() for o in m.get("options", [])]
+    return (
+        len(m.get("question", "").strip()) >= 10
+        and len(opts) == 4 and all(opts) and len(set(opts)) == 4
+        and 0 <= m.get("answer_index", -1) < 4
+        and m.get("difficulty") in DIFFICULTIES
+    )
+
+
+def _encode(m: Dict) -> bytes:
+    parts = [s.encode("utf-8")[:0xFFFF] for s in [m["question"], *m["options"], m.get("explanation") or ""]]
+    return _RECORD.pack(m["answer_index"], *map(len, parts)) + b"".join(parts)
+
+
+def write_corpus(path: str, cells: Dict[Cell, List[Dict]], model: str = LLM_MODEL_NAME):
+    """Write cells of MCQs as one corpus file, atomically replacing any previous build."""
+    cells = {c: ms for c, ms in sorted(cells.items()) if ms}
+    records, index, first = [], [], 0
+    for (skill, diff), ms in cells.items():
+        index.append((skill, diff, first, len(ms)))
+        records += [_encode(m) for m in ms]
+        first += len(ms)
+    offsets, pos = [], 0
+    for r in records:
+        offsets.append(pos)
+        pos += len(r)
+    offsets.append(pos)
+
+    model_b = model.encode("utf-8")
+    head = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(index), len(records), time.time()),
+            _LEN.pack(len(model_b)), model_b]
+    for skill, diff, start, count in index:
+        skill_b = skill.encode("utf-8")
+        head += [_LEN.pack(len(skill_b)), skill_b, _CELL.pack(DIFFICULTIES.index(diff), start, count)]
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(head))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for r in records:
+            f.write(r)
+    os.replace(tmp, path)
+
+
+class MCQCorpus:
+    """
+    Read-only view of a corpus file. Only the header and cell index are
+    parsed on open; records are decoded from the memory map on demand, so
+    every worker process shares the same pages.
+    """
+
+    def __init__(self, path: str = MCQ_CORPUS_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_cells, n_records, self.built_at = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path}: not a version {FORMAT_VERSION} MCQ corpus")
+        pos = _HEADER.size
+        self.model, pos = self._str(pos)
+        self.cells: Dict[Cell, Tuple[int, int]] = {}
+        for _ in range(n_cells):
+            skill, pos = self._str(pos)
+            code, start, count = _CELL.unpack_from(self._mm, pos)
+            pos += _CELL.size
+            self.cells[(skill, DIFFICULTIES[code])] = (start, count)
+        self.n_records = n_records
+        self._offsets = memoryview(self._mm)[pos:pos + 8 * (n_records + 1)].cast("Q")
+        self._data = pos + 8 * (n_records + 1)
+
+    def _str(self, pos: int) -> Tuple[str, int]:
+        (n,) = _LEN.unpack_from(self._mm, pos)
+        pos += _LEN.size
+        return bytes(self._mm[pos:pos + n]).decode("utf-8"), pos + n
+
+    def __len__(self) -> int:
+        return self.n_records
+
+    def count(self, skill: str, difficulty: str) -> int:
+        return self.cells.get((skill.lower(), difficulty), (0, 0))[1]
+
+    def record(self, i: int, skill: str = "", difficulty: str = "") -> Dict:
+        pos = self._data + self._offsets[i]
+        answer, *lens = _RECORD.unpack_from(self._mm, pos)
+        pos += _RECORD.size
+        parts = []
+        for n in lens:
+            parts.append(bytes(self._mm[pos:pos + n]).decode("utf-8", errors="replace"))
+            pos += n
+        return {"question": parts[0], "options": parts[1:5], "answer_index": answer,
+                "explanation": parts[5], "difficulty": difficulty, "skill": skill}
+
+    def sample(self, skill: str, difficulty: str, k: int, rng: random.Random = random) -> List[Dict]:
+        """Up to k distinct random MCQs of one skill/difficulty."""
+        start, count = self.cells.get((skill.lower(), difficulty), (0, 0))
+        picks = rng.sample(range(start, start + count), min(k, count)) if k > 0 else []
+        return [self.record(i, skill.lower(), difficulty) for i in picks]
+
+
+@st.cache_resource(show_spinner=False)
+def get_mcq_corpus() -> Optional[MCQCorpus]:
+    """The prebuilt corpus, or None if it has not been built (or is from another format version)."""
+    try:
+        return MCQCorpus()
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+def _shard_path(shard_dir: str, skill: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "_", skill.lower()).strip("_")
+    return os.path.join(shard_dir, f"{slug}-{hashlib.sha1(skill.encode('utf-8')).hexdigest()[:8]}.jsonl")
+
+
+def _init_worker(threads: int):
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def build_skill(skill: str, per_cell: int, rounds: int = 3) -> List[Dict]:
+    """
+    Generate, validate and near-deduplicate up to per_cell MCQs for each
+    difficulty of one skill, re-requesting the shortfall for a few rounds.
+    """
+    from modules.mcq_ai_generator import generate_skill_mcqs
+    from modules.dedup import deduplicate_mcq_list
+
+    kept: Dict[str, List[Dict]] = {d: [] for d in DIFFICULTIES}
+    for _ in range(rounds):
+        requests = [(skill, d, per_cell - len(kept[d])) for d in DIFFICULTIES if len(kept[d]) < per_cell]
+        if not requests:
+            break
+        for m in generate_skill_mcqs(requests, use_cache=False):
+            if valid_mcq(m):
+                kept[m["difficulty"]].append(m)
+        for d in DIFFICULTIES:
+            kept[d] = deduplicate_mcq_list(kept[d], near=True)[:per_cell]
+    return [m for d in DIFFICULTIES for m in kept[d]]
+
+
+def _write_shard(path: str, mcqs: List[Dict]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for m in mcqs:
+            f.write(json.dumps(m) + "\n")
+    os.replace(tmp, path)
+
+
+def _read_shard(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def build(out: str, skills: List[str], per_cell: int, workers: int, shard_dir: str,
+          fresh: bool = False, rounds: int = 3) -> Dict[str, int]:
+    todo = [s for s in skills if fresh or not os.path.exists(_shard_path(shard_dir, s))]
+    print(f"{len(skills) - len(todo)} skills already built, {len(todo)} to go", file=sys.stderr)
+    if todo:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            futures = {pool.submit(build_skill, s, per_cell, rounds): s for s in todo}
+            for i, fut in enumerate(as_completed(futures), 1):
+                skill = futures[fut]
+                try:
+                    mcqs = fut.result()
+                except Exception as e:
+                    print(f"[{i}/{len(todo)}] {skill}: failed ({e})", file=sys.stderr)
+                    continue
+                if mcqs:  # an empty result is retried on the next run
+                    _write_shard(_shard_path(shard_dir, skill), mcqs)
+                print(f"[{i}/{len(todo)}] {skill}: {len(mcqs)} MCQs", file=sys.stderr)
+
+    from modules.dedup import deduplicate_mcq_list
+    cells: Dict[Cell, List[Dict]] = {}
+    seen = set()
+    for skill in skills:
+        path = _shard_path(shard_dir, skill)
+        if not os.path.exists(path):
+            continue
+        for m in deduplicate_mcq_list(_read_shard(path)):
+            q = m["question"].strip().lower()
+            if q not in seen:  # the same generic question can come up under two skills
+                seen.add(q)
+                cells.setdefault((skill.lower(), m["difficulty"]), []).append(m)
+    write_corpus(out, cells)
+    return {f"{s}/{d}": len(ms) for (s, d), ms in sorted(cells.items())}
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Build or inspect the offline AI MCQ corpus.")
+    ap.add_argument("--out", default=MCQ_CORPUS_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="generate MCQs for every skill x difficulty")
+    b.add_argument("--skills", help="comma-separated subset of SKILL_KEYWORDS (default: all)")
+    b.add_argument("--per-cell", type=int, default=MCQ_CORPUS_PER_CELL, help="MCQs per skill x difficulty")
+    b.add_argument("--workers", type=int, default=1, help="generator processes (each loads the model)")
+    b.add_argument("--rounds", type=int, default=3, help="generation rounds to make up parse failures")
+    b.add_argument("--shards", default=None, help="per-skill shard directory (default: next to --out)")
+    b.add_argument("--fresh", action="store_true", help="regenerate skills that already have a shard")
+    sub.add_parser("info", help="print the corpus header and cell sizes")
+    args = ap.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    if args.cmd == "build":
+        skills = sorted(SKILL_KEYWORDS)
+        if args.skills:
+            skills = [s.strip().lower() for s in args.skills.split(",") if s.strip()]
+        shard_dir = args.shards or os.path.splitext(args.out)[0] + "_shards"
+        sizes = build(args.out, skills, args.per_cell, max(1, args.workers), shard_dir, args.fresh, args.rounds)
+        print(f"wrote {sum(sizes.values())} MCQs in {len(sizes)} cells to {args.out}", file=sys.stderr)
+    else:
+        corpus = MCQCorpus(args.out)
+        built = time.strftime("%Y-%m-%d %H:%M", time.localtime(corpus.built_at))
+        print(f"format v{FORMAT_VERSION}, model {corpus.model}, built {built}, {len(corpus)} MCQs")
+        for (skill, diff), (_, count) in sorted(corpus.cells.items()):
+            print(f"{skill}/{diff}\t{count}")
+
+
+if __name__ == "__main__":
+    main()
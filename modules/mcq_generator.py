@@ -1,9 +1,12 @@
 import random
-from typing import List, Dict
+from collections import OrderedDict
+from typing import List, Dict, Optional
 from config.roles import ROLE_SKILLS
 from modules.dedup import deduplicate_mcq_list  # ✅ correct import only
+from modules.question_bank import get_question_bank
 
 
+# Seed content for the question bank (modules.question_bank) on first use.
 QUESTION_BANK = {
     "python": {
         "easy": [
@@ -34,50 +37,66 @@ QUESTION_BANK["sql"] = {
     ],
 }
 
-QUESTION_BANK["default"] = QUESTION_BANK["python"]
+def bank_skills(role: str, skills: List[str]) -> List[str]:
+    """Resume skills, then role skills, that have items in the bank; python if none do."""
+    bank = get_question_bank()
+    wanted = OrderedDict.fromkeys(s.lower() for s in (skills or []) + ROLE_SKILLS.get(role, []) if s)
+    return [s for s in wanted if bank.count(s)] or ["python"]
 
 
-def get_bank(skill: str):
-    return QUESTION_BANK.get(skill.lower(), QUESTION_BANK["default"])
-
-
-def pick_unique(bank, level_key, count):
-    out = []
-    used = set()
-    items = bank[level_key]
-
-    for _ in range(count * 2):  # oversample to reduce duplicates
-        q, opts, idx, exp = random.choice(items)
-        if q not in used:
-            out.append({
-                "question": q,
-                "options": list(opts),
-                "answer_index": idx,
-                "explanation": exp,
-                "difficulty": level_key,
-            })
-            used.add(q)
-        if len(out) >= count:
+def _draw(bank, topics: List[str], diff: str, count: int, user: Optional[str]) -> List[Dict]:
+    """`count` items of one difficulty, from the first skill that has them, then the next."""
+    picked = []
+    for skill in topics:
+        picked += bank.sample(skill, diff, count - len(picked), user=user)
+        if len(picked) >= count:
             break
-
-    return out
-
-
-def generate_mcqs(role: str, skills: List[str], n: int, level: str) -> List[Dict]:
-    skill = (skills[0] if skills else None) or ROLE_SKILLS.get(role, ["python"])[0]
-    bank = get_bank(skill)
+    if len(picked) < count and user:
+        # This user has seen the whole cell: repeat questions rather than run short
+        have = [m["id"] for m in picked]
+        for skill in topics:
+            picked += bank.sample(skill, diff, count - len(picked), exclude=have)
+            if len(picked) >= count:
+                break
+    return picked
+
+
+def generate_mcqs(role: str, skills: List[str], n: int, level: str, user: Optional[str] = None) -> List[Dict]:
+    """
+    Draw n MCQs (30% easy / 50% intermediate / 20% advanced) from the
+    question bank, taking each difficulty from the first skill that has
+    items and topping up from the next. With `user`, questions that user
+    has already been served are skipped and the new ones are marked seen.
+    """
+    bank = get_question_bank()
+    topics = bank_skills(role, skills)
 
     n_easy = max(1, int(n * 0.30))
     n_mid = max(1, int(n * 0.50))
     n_adv = max(1, n - n_easy - n_mid)
 
-    mcqs = (
-        pick_unique(bank, "easy", n_easy)
-        + pick_unique(bank, "intermediate", n_mid)
-        + pick_unique(bank, "advanced", n_adv)
-    )
+    mcqs = []
+    for diff, count in (("easy", n_easy), ("intermediate", n_mid), ("advanced", n_adv)):
+        mcqs += _draw(bank, topics, diff, count, user)
 
     mcqs = deduplicate_mcq_list(mcqs)
     random.shuffle(mcqs)
-
-    return mcqs[:n]
+    mcqs = mcqs[:n]
+    if user:
+        bank.mark_seen(user, [m["id"] for m in mcqs])
+
+    return mcqs
+
+
+def generate_mcq_pool(role: str, skills: List[str], per_difficulty: int, user: Optional[str] = None) -> List[Dict]:
+    """
+    Up to `per_difficulty` MCQs of each difficulty for adaptive practice,
+    which serves only some of them. Nothing is marked seen here; the caller
+    marks the questions it actually serves.
+    """
+    bank = get_question_bank()
+    topics = bank_skills(role, skills)
+    pool = [m for diff in ("easy", "intermediate", "advanced") for m in _draw(bank, topics, diff, per_difficulty, user)]
+    pool = deduplicate_mcq_list(pool)
+    random.shuffle(pool)
+    return pool
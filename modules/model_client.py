@@ -0,0 +1,58 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Optional
+from config.runtime import MODEL_SERVER_URL, MODEL_SERVER_TIMEOUT_S
+
+_state = {"url": MODEL_SERVER_URL}
+
+
+def remote_enabled() -> bool:
+    return bool(_state["url"])
+
+
+def disable_remote():
+    """Called by the model server itself so its own generate calls stay in-process."""
+    _state["url"] = ""
+
+
+def health(timeout: float = 2.0) -> Optional[Dict]:
+    url = _state["url"]
+    if not url:
+        return None
+    try:
+        with urllib.request.urlopen(url + "/health", timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+
+def call(path: str, payload: Dict) -> Optional[Dict]:
+    """
+    POST `payload` as JSON to the model server. Retries with backoff while the
+    server sheds load (503); returns None if it is unreachable or keeps refusing.
+    """
+    url = _state["url"]
+    if not url:
+        return None
+    deadline = time.monotonic() + MODEL_SERVER_TIMEOUT_S
+    delay = 0.2
+    body = json.dumps(payload).encode("utf-8")
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        req = urllib.request.Request(
+            url + path, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=remaining) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code != 503 or time.monotonic() + delay >= deadline:
+                return None
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
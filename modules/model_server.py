@@ -0,0 +1,130 @@
+"""
+Local inference daemon shared by all Streamlit workers on a host.
+
+    python -m modules.model_server [--host 127.0.0.1] [--port 8765] [--threads 4] [--max-queue 64]
+
+Then start the app with MODEL_SERVER_URL=http://127.0.0.1:8765.
+
+Endpoints (JSON):
+    POST /generate  {"prompts": [...], "max_tokens", "temperature", "deterministic", "use_cache",
+                     "stop", "max_items", "item_kind", "max_time"} -> {"texts": [...]}
+    POST /skills    {"texts": [...]} -> {"skills": [[...], ...]}
+    GET  /health    -> {"status", "inflight", "max_queue", "backend"}
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.runtime import MODEL_SERVER_HOST, MODEL_SERVER_PORT, MODEL_SERVER_MAX_QUEUE, MODEL_SERVER_THREADS
+from modules import model_client
+
+
+class _Admission:
+    """Bounded admission: at most `limit` requests queued or running at once."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.inflight = 0
+        self._lock = threading.Lock()
+
+    def try_enter(self) -> bool:
+        with self._lock:
+            if self.inflight >= self.limit:
+                return False
+            self.inflight += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.inflight -= 1
+
+
+class ModelRequestHandler(BaseHTTPRequestHandler):
+    admission: _Admission = None  # set by serve()
+
+    def _send(self, code: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": "not found"})
+        from modules.llm import BACKEND_INFO
+        self._send(200, {
+            "status": "ok",
+            "inflight": self.admission.inflight,
+            "max_queue": self.admission.limit,
+            "backend": BACKEND_INFO,
+        })
+
+    def do_POST(self):
+        if self.path not in ("/generate", "/skills"):
+            return self._send(404, {"error": "not found"})
+        if not self.admission.try_enter():
+            return self._send(503, {"error": "busy"}, {"Retry-After": "1"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/generate":
+                from modules.llm import generate_texts
+                texts = generate_texts(
+                    list(payload.get("prompts", [])),
+                    max_tokens=int(payload.get("max_tokens", 512)),
+                    temperature=float(payload.get("temperature", 0.9)),
+                    deterministic=payload.get("deterministic"),
+                    use_cache=bool(payload.get("use_cache", True)),
+                    stop=list(payload.get("stop") or []),
+                    max_items=payload.get("max_items") or 0,
+                    item_kind=str(payload.get("item_kind", "")),
+                    max_time=float(payload.get("max_time", 0.0)),
+                )
+                self._send(200, {"texts": texts})
+            else:
+                from modules.resume_parser import extract_skills_batch
+                self._send(200, {"skills": extract_skills_batch(list(payload.get("texts", [])))})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+        finally:
+            self.admission.leave()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str, port: int, max_queue: int, threads: int, preload: bool = True):
+    model_client.disable_remote()
+    if threads > 0:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    if preload:
+        from modules.llm import load_llm
+        from modules.resume_parser import load_spacy
+        load_llm()
+        load_spacy()
+    ModelRequestHandler.admission = _Admission(max_queue)
+    server = ThreadingHTTPServer((host, port), ModelRequestHandler)
+    server.daemon_threads = True
+    print(f"Model server listening on http://{host}:{port} (max queue {max_queue}, threads {threads or 'default'})")
+    server.serve_forever()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Shared flan-t5 / spaCy inference server for Streamlit workers.")
+    ap.add_argument("--host", default=MODEL_SERVER_HOST)
+    ap.add_argument("--port", type=int, default=MODEL_SERVER_PORT)
+    ap.add_argument("--max-queue", type=int, default=MODEL_SERVER_MAX_QUEUE)
+    ap.add_argument("--threads", type=int, default=MODEL_SERVER_THREADS, help="torch intra-op threads (0 = default)")
+    ap.add_argument("--no-preload", action="store_true", help="load models on first request instead of at startup")
+    args = ap.parse_args()
+    serve(args.host, args.port, args.max_queue, args.threads, preload=not args.no_preload)
+
+
+if __name__ == "__main__":
+    main()
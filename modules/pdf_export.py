@@ -1,8 +1,10 @@
 from io import BytesIO
 from typing import List, Dict, Tuple, Optional
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import A4
+from modules.lazy import lazy_import
+
+platypus = lazy_import("reportlab.platypus")
+rl_styles = lazy_import("reportlab.lib.styles")
+rl_pagesizes = lazy_import("reportlab.lib.pagesizes")
 
 def export_pdf_bytes(
     questions: List[str],
@@ -14,16 +16,16 @@ def export_pdf_bytes(
     practice_results: Optional[List[Dict]] = None,
     per_q_time: Optional[int] = None,
 ) -> bytes:
-    styles = getSampleStyleSheet()
+    styles = rl_styles.getSampleStyleSheet()
     story = []
 
     def h2(text):
-        story.append(Paragraph(f"<b>{text}</b>", styles["Heading2"]))
-        story.append(Spacer(1, 10))
+        story.append(platypus.Paragraph(f"<b>{text}</b>", styles["Heading2"]))
+        story.append(platypus.Spacer(1, 10))
 
     def p(text):
-        story.append(Paragraph(text, styles["BodyText"]))
-        story.append(Spacer(1, 6))
+        story.append(platypus.Paragraph(text, styles["BodyText"]))
+        story.append(platypus.Spacer(1, 6))
 
     h2("AI Interview Report")
 
@@ -69,5 +71,5 @@ def export_pdf_bytes(
               f"Score={r.get('score')}, Time Left={r.get('time_left')}s")
 
     buffer = BytesIO()
-    SimpleDocTemplate(buffer, pagesize=A4).build(story)
+    platypus.SimpleDocTemplate(buffer, pagesize=rl_pagesizes.A4).build(story)
     return buffer.getvalue()
@@ -0,0 +1,137 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+from config.runtime import (
+    PDF_CACHE_DIR, PDF_MAX_PAGES, PDF_MAX_BYTES, PDF_WORKERS, PDF_PARALLEL_MIN_PAGES,
+)
+from modules.lazy import lazy_import
+
+pdfplumber = lazy_import("pdfplumber")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def pdf_bytes(file) -> bytes:
+    """Raw bytes of a path, bytes object or file-like (e.g. a Streamlit UploadedFile)."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            return f.read()
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+class PageCache:
+    """On-disk page texts keyed by SHA-256 of the PDF bytes; survives restarts."""
+
+    def __init__(self, root: str = PDF_CACHE_DIR):
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + ".json")
+
+    def get(self, digest: str) -> Optional[List[str]]:
+        try:
+            with open(self._path(digest), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, digest: str, pages: List[str]):
+        path = self._path(digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(pages, f)
+            os.replace(tmp, path)  # atomic: readers never see a half-written entry
+        except OSError:
+            pass
+
+
+PAGE_CACHE = PageCache()
+
+
+def _extract_range(data: bytes, start: int, stop: int) -> List[str]:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [(pdf.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: the server process already runs the batcher, pregen,
+            # tornado and torch threads, and a forked child can inherit their held locks.
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def iter_pdf_pages(file, use_cache: bool = True) -> Iterator[str]:
+    """
+    Yield page texts one at a time as they are extracted (or straight from
+    the cache), so callers can start scanning early pages immediately.
+    """
+    data = pdf_bytes(file)
+    if not data or len(data) > PDF_MAX_BYTES:
+        return
+    digest = hashlib.sha256(data).hexdigest()
+    cached = PAGE_CACHE.get(digest) if use_cache else None
+    if cached is not None:
+        yield from cached
+        return
+    pages = []
+    try:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for page in pdf.pages[:PDF_MAX_PAGES]:
+                t = page.extract_text() or ""
+                pages.append(t)
+                yield t
+    except Exception:
+        return
+    if use_cache:
+        PAGE_CACHE.put(digest, pages)
+
+
+def extract_pdf_pages(file, use_cache: bool = True, parallel: bool = True) -> List[str]:
+    """
+    All page texts of a PDF. Documents with many pages are split into
+    contiguous page ranges extracted by a process pool.
+    """
+    data = pdf_bytes(file)
+    if not data or len(data) > PDF_MAX_BYTES:
+        return []
+    digest = hashlib.sha256(data).hexdigest()
+    cached = PAGE_CACHE.get(digest) if use_cache else None
+    if cached is not None:
+        return cached
+    try:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            n_pages = min(len(pdf.pages), PDF_MAX_PAGES)
+            if not parallel or PDF_WORKERS <= 1 or n_pages < PDF_PARALLEL_MIN_PAGES:
+                pages = [(p.extract_text() or "") for p in pdf.pages[:n_pages]]
+            else:
+                pages = None
+        if pages is None:
+            step = -(-n_pages // PDF_WORKERS)
+            ranges = [(s, min(s + step, n_pages)) for s in range(0, n_pages, step)]
+            futures = [_get_pool().submit(_extract_range, data, s, e) for s, e in ranges]
+            pages = [t for fut in futures for t in fut.result()]
+    except Exception:
+        return []
+    if use_cache:
+        PAGE_CACHE.put(digest, pages)
+    return pages
+
+
+def extract_pdf_text(file, use_cache: bool = True, parallel: bool = True) -> str:
+    return "".join(t + "\n" for t in extract_pdf_pages(file, use_cache=use_cache, parallel=parallel))
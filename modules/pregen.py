@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import streamlit as st
+from config.roles import ROLE_SKILLS, DIFFICULTY_SETTINGS
+from config.llm import (
+    PREGEN_ENABLED, PREGEN_DEPTH_HR, PREGEN_DEPTH_TECH, PREGEN_DEPTH_MCQ,
+    PREGEN_BATCH, PREGEN_IDLE_SLEEP_S, PREGEN_RETRY_S, PREGEN_RETRY_MAX_S, LLM_BATCH_MAX_SIZE,
+)
+from modules.llm import generate_text, get_batcher, llm_available
+from modules.ai_utils import parse_bulleted
+from modules.dedup import MinHashLSH
+
+PoolKey = Tuple[str, str, str]  # (kind, role-or-skill, level); level is "" for MCQs
+
+
+def _produce(key: PoolKey) -> List:
+    # Imported here: question_ai / mcq_ai_generator draw from these pools themselves.
+    from modules.question_ai import HR_PROMPT, TECH_PROMPT
+    from modules.mcq_ai_generator import difficulty_counts, generate_skill_mcqs
+
+    kind, name, level = key
+    if kind == "hr":
+        txt = generate_text(HR_PROMPT.format(n=PREGEN_BATCH, role=name, level=level),
+                            max_tokens=800, temperature=0.8, use_cache=False,
+                            max_items=PREGEN_BATCH, item_kind="bullets")
+        return parse_bulleted(txt)
+    if kind == "tech":
+        skills_txt = ", ".join(ROLE_SKILLS.get(name, [])) or "general fundamentals"
+        txt = generate_text(TECH_PROMPT.format(n=PREGEN_BATCH, role=name, level=level, skills=skills_txt),
+                            max_tokens=900, temperature=0.85, use_cache=False,
+                            max_items=PREGEN_BATCH, item_kind="bullets")
+        return parse_bulleted(txt)
+    counts = difficulty_counts(PREGEN_BATCH)
+    return generate_skill_mcqs([(name, d, c) for d, c in counts.items()], use_cache=False)
+
+
+def _text(item) -> str:
+    return item["question"] if isinstance(item, dict) else item
+
+
+class QuestionPools:
+    """
+    Warm pools of AI-generated HR/Tech questions (per role x level) and MCQs
+    (per skill: the MCQ prompt has no level, each item carries its own
+    difficulty). A daemon thread tops up the emptiest pool whenever
+    the LLM batcher has no interactive work queued.
+    """
+
+    def __init__(self):
+        self._targets: Dict[PoolKey, int] = {}
+        for level in DIFFICULTY_SETTINGS:
+            for role in ROLE_SKILLS:
+                self._targets[("hr", role, level)] = PREGEN_DEPTH_HR
+                self._targets[("tech", role, level)] = PREGEN_DEPTH_TECH
+        for skill in sorted({s for skills in ROLE_SKILLS.values() for s in skills}):
+            self._targets[("mcq", skill, "")] = PREGEN_DEPTH_MCQ
+        self._pools: Dict[PoolKey, deque] = {k: deque() for k in self._targets}
+        # Everything ever pooled per key, so paraphrases of served questions are not re-added
+        self._seen: Dict[PoolKey, MinHashLSH] = {}
+        self._misses: Dict[PoolKey, int] = {k: 0 for k in self._targets}
+        self._retry_at: Dict[PoolKey, float] = {k: 0.0 for k in self._targets}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="pregen", daemon=True)
+        self._thread.start()
+
+    def take(self, key: PoolKey, n: int) -> List:
+        """Pop up to n items from a pool (fewer if it is not warm yet) and schedule a refill."""
+        with self._lock:
+            pool = self._pools.get(key)
+            if not pool:
+                return []
+            out = [pool.popleft() for _ in range(min(n, len(pool)))]
+        self._wake.set()
+        return out
+
+    def depth(self, key: PoolKey) -> int:
+        with self._lock:
+            return len(self._pools.get(key, ()))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"/".join(k): len(p) for k, p in self._pools.items()}
+
+    def _next_key(self) -> Optional[PoolKey]:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                (len(self._pools[k]) / t, k) for k, t in self._targets.items()
+                if len(self._pools[k]) < t and self._retry_at[k] <= now
+            ]
+        return min(candidates)[1] if candidates else None
+
+    def _llm_idle(self) -> bool:
+        return LLM_BATCH_MAX_SIZE <= 1 or get_batcher().pending() == 0
+
+    def _refill(self, key: PoolKey):
+        items = _produce(key)
+        added = 0
+        with self._lock:
+            seen = self._seen.setdefault(key, MinHashLSH())
+            for it in items:
+                text = _text(it).strip()
+                if text and seen.add_if_new(len(seen), text):
+                    self._pools[key].append(it)
+                    added += 1
+            if added:
+                self._misses[key] = 0
+            else:
+                self._miss(key)
+
+    def _miss(self, key: PoolKey):
+        """Back off a key that produced nothing new (errors, parse failures, duplicates); caller holds the lock."""
+        self._misses[key] += 1
+        delay = min(PREGEN_RETRY_MAX_S, PREGEN_RETRY_S * 2 ** (self._misses[key] - 1))
+        self._retry_at[key] = time.monotonic() + delay
+
+    def _loop(self):
+        available = False
+        while True:
+            key = self._next_key()
+            # Availability is re-checked until it holds, e.g. while the model server starts up
+            if key is not None and not available:
+                available = llm_available()
+            if key is None or not available or not self._llm_idle():
+                self._wake.wait(PREGEN_IDLE_SLEEP_S)
+                self._wake.clear()
+                continue
+            try:
+                self._refill(key)
+            except Exception:
+                with self._lock:
+                    self._miss(key)
+
+
+@st.cache_resource(show_spinner=False)
+def get_pools() -> Optional[QuestionPools]:
+    if not PREGEN_ENABLED:
+        return None
+    return QuestionPools()
+
+
+def take_from_pool(kind: str, name: str, level: str, n: int) -> List:
+    """Draw up to n pre-generated items; returns [] when pre-generation is disabled."""
+    pools = get_pools()
+    return pools.take((kind, name, level), n) if pools is not None else []
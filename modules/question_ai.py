@@ -1,5 +1,6 @@
-from typing import List
-from modules.llm import generate_text
+from typing import Iterator, List
+from config.llm import LLM_INTERACTIVE_MAX_TIME_S
+from modules.llm import generate_text, stream_text
 from modules.ai_utils import parse_bulleted
 
 HR_PROMPT = """Generate {n} {level} HR interview questions for a {role}.
@@ -19,15 +20,21 @@ Answer holistically with context, approach, metrics, tradeoffs, and conclusion.
 """
 
 def generate_ai_hr_questions(role: str, level: str, n: int) -> List[str]:
-    txt = generate_text(HR_PROMPT.format(n=n, role=role, level=level), max_tokens=800, temperature=0.8)
+    # Stop as soon as n complete questions are out; max_tokens is only a backstop
+    txt = generate_text(HR_PROMPT.format(n=n, role=role, level=level), max_tokens=800, temperature=0.8,
+                        max_items=n, item_kind="bullets", max_time=LLM_INTERACTIVE_MAX_TIME_S)
     qs = parse_bulleted(txt)
     return qs[:n] if len(qs) >= n else qs
 
 def generate_ai_tech_questions(role: str, level: str, n: int, skills: List[str]) -> List[str]:
     skills_txt = ", ".join(skills) if skills else "general fundamentals"
-    txt = generate_text(TECH_PROMPT.format(n=n, role=role, level=level, skills=skills_txt), max_tokens=900, temperature=0.85)
+    txt = generate_text(TECH_PROMPT.format(n=n, role=role, level=level, skills=skills_txt), max_tokens=900, temperature=0.85,
+                        max_items=n, item_kind="bullets", max_time=LLM_INTERACTIVE_MAX_TIME_S)
     qs = parse_bulleted(txt)
     return qs[:n] if len(qs) >= n else qs
 
 def generate_ai_answer(question: str, role: str, level: str) -> str:
     return generate_text(ANS_PROMPT.format(role=role, level=level, q=question), max_tokens=600, temperature=0.7)
+
+def stream_ai_answer(question: str, role: str, level: str) -> Iterator[str]:
+    return stream_text(ANS_PROMPT.format(role=role, level=level, q=question), max_tokens=600, temperature=0.7)
@@ -0,0 +1,254 @@
+"""
+Persistent MCQ bank in SQLite, indexed by skill x difficulty.
+
+Each (skill, difficulty) cell numbers its items with contiguous slots
+0..n-1, so drawing k random items is k primary-key lookups rather than a
+scan. Nothing is loaded into memory up front; every process just opens
+the file.
+
+    python -m modules.question_bank import generated.jsonl curated.jsonl --source curated
+    python -m modules.question_bank stats
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+import streamlit as st
+from config.runtime import QUESTION_BANK_PATH
+
+DIFFICULTIES = ("easy", "intermediate", "advanced")
+
+# Below this many items per requested question, scanning the cell is
+# cheaper than rejection-sampling slots.
+_SCAN_RATIO = 4
+
+
+def _item_hash(skill: str, question: str) -> str:
+    key = skill + "\n" + " ".join(question.lower().split())
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:20]
+
+
+def _valid(item: Dict) -> bool:
+    opts = item.get("options")
+    idx = item.get("answer_index")
+    return (
+        isinstance(item.get("question"), str) and item["question"].strip() != ""
+        and isinstance(opts, (list, tuple)) and len(opts) >= 2
+        and isinstance(idx, int) and 0 <= idx < len(opts)
+        and item.get("difficulty") in DIFFICULTIES
+        and isinstance(item.get("skill"), str) and item["skill"].strip() != ""
+    )
+
+
+class QuestionBank:
+    def __init__(self, path: str = QUESTION_BANK_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY, skill TEXT NOT NULL, difficulty TEXT NOT NULL,
+                slot INTEGER NOT NULL, question TEXT NOT NULL, options TEXT NOT NULL,
+                answer_index INTEGER NOT NULL, explanation TEXT NOT NULL DEFAULT '',
+                source TEXT NOT NULL DEFAULT '', hash TEXT UNIQUE NOT NULL, added REAL NOT NULL);
+            CREATE UNIQUE INDEX IF NOT EXISTS questions_cell ON questions(skill, difficulty, slot);
+            CREATE TABLE IF NOT EXISTS cells (
+                skill TEXT NOT NULL, difficulty TEXT NOT NULL, n INTEGER NOT NULL,
+                PRIMARY KEY (skill, difficulty)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS seen (
+                user TEXT NOT NULL, qid INTEGER NOT NULL, at REAL NOT NULL,
+                PRIMARY KEY (user, qid)) WITHOUT ROWID;
+            """
+        )
+        if not len(self):
+            from modules.mcq_generator import QUESTION_BANK
+            self.import_items(
+                [
+                    {"skill": skill, "difficulty": diff, "question": q, "options": list(opts),
+                     "answer_index": idx, "explanation": exp}
+                    for skill, cells in QUESTION_BANK.items() if skill != "default"
+                    for diff, rows in cells.items()
+                    for q, opts, idx, exp in rows
+                ],
+                source="seed",
+            )
+
+    def import_items(self, items: Iterable[Dict], source: str = "") -> int:
+        """
+        Bulk-add MCQ dicts (question, options, answer_index, explanation,
+        difficulty, skill) in one transaction. Invalid items and questions
+        already in the bank for the same skill are skipped; returns the
+        number added.
+        """
+        added = 0
+        now = time.time()
+        with self._lock, self._conn:
+            sizes: Dict = {}
+            for it in items:
+                if not _valid(it):
+                    continue
+                skill = it["skill"].strip().lower()
+                cell = (skill, it["difficulty"])
+                if cell not in sizes:
+                    row = self._conn.execute(
+                        "SELECT n FROM cells WHERE skill = ? AND difficulty = ?", cell
+                    ).fetchone()
+                    sizes[cell] = row[0] if row else 0
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO questions (skill, difficulty, slot, question, options,"
+                    " answer_index, explanation, source, hash, added) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (skill, it["difficulty"], sizes[cell], it["question"].strip(), json.dumps(list(it["options"])),
+                     it["answer_index"], it.get("explanation") or "", source,
+                     _item_hash(skill, it["question"]), now),
+                )
+                if cur.rowcount:
+                    sizes[cell] += 1
+                    added += 1
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cells (skill, difficulty, n) VALUES (?, ?, ?)",
+                [(s, d, n) for (s, d), n in sizes.items()],
+            )
+        return added
+
+    def count(self, skill: str, difficulty: Optional[str] = None) -> int:
+        with self._lock:
+            if difficulty is None:
+                row = self._conn.execute("SELECT SUM(n) FROM cells WHERE skill = ?", (skill.lower(),)).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT n FROM cells WHERE skill = ? AND difficulty = ?", (skill.lower(), difficulty)
+                ).fetchone()
+        return (row[0] or 0) if row else 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(n), 0) FROM cells").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT skill, difficulty, n FROM cells ORDER BY skill, difficulty").fetchall()
+        return {f"{s}/{d}": n for s, d, n in rows}
+
+    _COLUMNS = "q.id, q.question, q.options, q.answer_index, q.explanation, q.difficulty, q.skill"
+
+    @staticmethod
+    def _to_item(row) -> Dict:
+        qid, question, options, idx, exp, diff, skill = row
+        return {"id": qid, "question": question, "options": json.loads(options), "answer_index": idx,
+                "explanation": exp, "difficulty": diff, "skill": skill}
+
+    def sample(self, skill: str, difficulty: str, k: int, user: Optional[str] = None,
+               exclude: Iterable[int] = (), rng: random.Random = random) -> List[Dict]:
+        """
+        Up to k distinct random items of one cell, skipping ids the user has
+        already seen and ids in `exclude`. Random slots are drawn and fetched
+        by index, so the cost grows with k, not with the size of the cell.
+        """
+        skill = skill.lower()
+        n = self.count(skill, difficulty)
+        if k <= 0 or n == 0:
+            return []
+        excluded = set(exclude)
+        out: List[Dict] = []
+        with self._lock:
+            if n >= _SCAN_RATIO * k:
+                tried = set()
+                for _ in range(3):  # rejection rounds; seen items come back empty-handed
+                    want = k - len(out)
+                    if want <= 0:
+                        break
+                    slots = set()
+                    while len(slots) < min(2 * want, n - len(tried)):
+                        s = rng.randrange(n)
+                        if s not in tried:
+                            slots.add(s)
+                    if not slots:
+                        break
+                    tried |= slots
+                    marks = ",".join("?" * len(slots))
+                    rows = self._conn.execute(
+                        f"SELECT {self._COLUMNS} FROM questions q"
+                        " LEFT JOIN seen s ON s.user = ? AND s.qid = q.id"
+                        f" WHERE q.skill = ? AND q.difficulty = ? AND q.slot IN ({marks}) AND s.qid IS NULL",
+                        (user or "", skill, difficulty, *slots),
+                    ).fetchall()
+                    rows = [r for r in rows if r[0] not in excluded]
+                    rng.shuffle(rows)
+                    out += [self._to_item(r) for r in rows[:want]]
+            if len(out) < k:
+                # Small cell or mostly seen: pick from everything that is left.
+                skip = excluded | {m["id"] for m in out}
+                rows = self._conn.execute(
+                    f"SELECT {self._COLUMNS} FROM questions q"
+                    " LEFT JOIN seen s ON s.user = ? AND s.qid = q.id"
+                    " WHERE q.skill = ? AND q.difficulty = ? AND s.qid IS NULL",
+                    (user or "", skill, difficulty),
+                ).fetchall()
+                rows = [r for r in rows if r[0] not in skip]
+                out += [self._to_item(r) for r in rng.sample(rows, min(k - len(out), len(rows)))]
+        return out
+
+    def mark_seen(self, user: str, ids: Iterable[int]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (user, qid, at) VALUES (?, ?, ?)", [(user, i, now) for i in ids]
+            )
+
+    def reset_seen(self, user: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM seen WHERE user = ?", (user,))
+
+
+@st.cache_resource(show_spinner=False)
+def get_question_bank() -> QuestionBank:
+    return QuestionBank()
+
+
+def _read_items(path: str) -> Iterable[Dict]:
+    """MCQ dicts from a .json list or a JSONL file."""
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Maintain the MCQ question bank.")
+    ap.add_argument("--db", default=QUESTION_BANK_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="bulk-import MCQs from .json / .jsonl files")
+    imp.add_argument("files", nargs="+")
+    imp.add_argument("--source", default="import", help="label stored with the imported items")
+    sub.add_parser("stats", help="items per skill/difficulty")
+    args = ap.parse_args(argv)
+
+    bank = QuestionBank(args.db)
+    if args.cmd == "import":
+        for path in args.files:
+            added = bank.import_items(_read_items(path), source=args.source)
+            print(f"{path}: added {added}", file=sys.stderr)
+        print(f"{len(bank)} items total", file=sys.stderr)
+    else:
+        for cell, n in bank.stats().items():
+            print(f"{cell}\t{n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from config.roles import ROLE_SKILLS
 from config.prompts import HR_SUFFIX_BY_LEVEL, TECH_TEMPLATES
 from modules.question_ai import generate_ai_hr_questions, generate_ai_tech_questions
 from modules.dedup import deduplicate_text_list
+from modules.pregen import take_from_pool
 
 
 def simple_hr_questions(role: str, level: str, n: int) -> List[str]:
@@ -34,21 +35,27 @@ def simple_tech_questions(role: str, level: str, skills: List[str], n: int) -> L
     tag = {"Beginner": "(Basics)", "Intermediate": "(Depth)", "Advanced": "(Systems/Scale)"}[level]
     final = [f"{q} {tag}" for q in pool[:n]]
 
-    return deduplicate_text_list(final)
+    return deduplicate_text_list(final, near=True)
 
 
 # AI versions
 def ai_hr_questions(role: str, level: str, n: int) -> List[str]:
-    qs = generate_ai_hr_questions(role, level, n)
+    # Serve pre-generated questions first; only the shortfall is generated live
+    qs = take_from_pool("hr", role, level, n)
+    if len(qs) < n:
+        qs += generate_ai_hr_questions(role, level, n - len(qs))
     # Fallback to simple questions if AI generation returns empty results
     if not qs or len(qs) == 0:
         qs = simple_hr_questions(role, level, n)
-    return deduplicate_text_list(qs)
+    return deduplicate_text_list(qs, near=True)
 
 
 def ai_tech_questions(role: str, level: str, n: int, skills: List[str]) -> List[str]:
-    qs = generate_ai_tech_questions(role, level, n, skills)
+    # Pools are generated for the role's own skills, so only use them without resume skills
+    qs = [] if skills else take_from_pool("tech", role, level, n)
+    if len(qs) < n:
+        qs += generate_ai_tech_questions(role, level, n - len(qs), skills)
     # Fallback to simple questions if AI generation returns empty results
     if not qs or len(qs) == 0:
         qs = simple_tech_questions(role, level, skills, n)
-    return deduplicate_text_list(qs)
+    return deduplicate_text_list(qs, near=True)
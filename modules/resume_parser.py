@@ -1,44 +1,73 @@
-import pdfplumber
-import spacy
 import streamlit as st
-from typing import List
-from config.roles import SKILL_KEYWORDS
+from typing import Iterator, List, Tuple
+from modules.skill_matcher import SKILL_MATCHER
+from modules.lazy import lazy_import
+from modules import model_client
+from modules.pdf_text import extract_pdf_text, iter_pdf_pages
+from config.runtime import SPACY_MODEL, SPACY_EXCLUDE, SPACY_BATCH_SIZE, SPACY_N_PROCESS
+
+spacy = lazy_import("spacy")
 
 @st.cache_resource(show_spinner=False)
 def load_spacy():
     try:
-        return spacy.load("en_core_web_sm")
+        return spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
     except Exception:
         return None
 
-@st.cache_data(show_spinner=False)
+def read_pdf_text(file) -> str:
+    """PDF text for batch jobs: disk-cached, but pages extracted in-process (no nested pool)."""
+    return extract_pdf_text(file, parallel=False)
+
 def extract_text_from_pdf(file) -> str:
-    text = ""
-    try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                t = page.extract_text() or ""
-                text += t + "\n"
-    except Exception:
-        return ""
-    return text
+    # Cached on disk by SHA-256 of the bytes, so re-uploads and restarts hit the cache
+    return extract_pdf_text(file)
 
-@st.cache_data(show_spinner=False)
-def extract_skills(text: str) -> List[str]:
-    nlp = load_spacy()
-    text_l = (text or "").lower()
+def iter_page_skills(file) -> Iterator[Tuple[int, str, List[str]]]:
+    """
+    Stream (page number, page text, keyword skills found so far) while the PDF
+    is parsed, for early feedback before spaCy runs on the full text.
+    """
     found = set()
-    for kw in SKILL_KEYWORDS:
-        if f" {kw} " in f" {text_l} ":
-            found.add(kw)
+    for i, page in enumerate(iter_pdf_pages(file), start=1):
+        found.update(SKILL_MATCHER.find(page))
+        yield i, page, sorted(found)
+
+def _doc_skills(doc) -> set:
+    found = set()
+    for tok in doc:
+        t = SKILL_MATCHER.lookup(tok.text.strip())
+        if t:
+            found.add(t)
+    if not doc.has_annotation("DEP"):  # noun_chunks needs the parser
+        return found
+    for chunk in doc.noun_chunks:
+        c = SKILL_MATCHER.lookup(chunk.text.strip())
+        if c:
+            found.add(c)
+    return found
+
+def extract_skills_batch(
+    texts: List[str], batch_size: int = SPACY_BATCH_SIZE, n_process: int = SPACY_N_PROCESS
+) -> List[List[str]]:
+    """
+    Skills for many resumes at once: spaCy runs over them with nlp.pipe
+    (batch_size docs per batch, n_process worker processes).
+    """
+    # Shared model server owns spaCy when configured; fall back to a local copy
+    if texts and model_client.remote_enabled():
+        resp = model_client.call("/skills", {"texts": [t or "" for t in texts]})
+        if resp is not None:
+            return resp["skills"]
+    nlp = load_spacy()
+    lowered = [(t or "").lower() for t in texts]
+    found = [set(SKILL_MATCHER.find(t)) for t in lowered]
     if nlp:
-        doc = nlp(text_l)
-        for tok in doc:
-            t = tok.text.strip()
-            if t in SKILL_KEYWORDS:
-                found.add(t)
-        for chunk in getattr(doc, "noun_chunks", []):
-            c = chunk.text.strip()
-            if c in SKILL_KEYWORDS:
-                found.add(c)
-    return sorted(found)
+        docs = nlp.pipe(lowered, batch_size=batch_size, n_process=n_process)
+        for f, doc in zip(found, docs):
+            f |= _doc_skills(doc)
+    return [sorted(f) for f in found]
+
+@st.cache_data(show_spinner=False)
+def extract_skills(text: str) -> List[str]:
+    return extract_skills_batch([text], n_process=1)[0]
@@ -1,4 +1,10 @@
+from typing import Dict, NamedTuple
+from modules.lazy import lazy_import
+
+np = lazy_import("numpy")
+
 MCQ_DIFFICULTY_WEIGHTS = {"Beginner": 1.0, "Intermediate": 1.3, "Advanced": 1.6}
+MCQ_CHECK_POINTS = (5, -1)  # MCQ tab: points for a correct / wrong answer
 
 def score_mcq(selected: int, correct: int, level: str, time_left: int) -> int:
     if selected is None or selected < 0:
@@ -7,3 +13,62 @@ def score_mcq(selected: int, correct: int, level: str, time_left: int) -> int:
     bonus = int((time_left or 0) / 10)
     mult = MCQ_DIFFICULTY_WEIGHTS.get(level, 1.0)
     return int(base * mult + (bonus if selected == correct else 0))
+
+
+def grade_mcqs(selected, correct):
+    """
+    Grade a page of MCQ answers at once: (is_correct, points) arrays for
+    parallel sequences of selected and correct option indexes.
+    """
+    selected = np.asarray(selected, dtype=np.int64)
+    is_correct = selected == np.asarray(correct, dtype=np.int64)
+    return is_correct, np.where(is_correct, *MCQ_CHECK_POINTS)
+
+
+def _labels(values) -> "np.ndarray":
+    """A string array of level/difficulty labels (None becomes "None", like str())."""
+    arr = np.asarray(values)
+    return arr.astype(str) if arr.dtype.kind not in "U" else arr
+
+
+class BatchScore(NamedTuple):
+    scores: "np.ndarray"  # per-item points, int64
+    total: int
+    by_difficulty: Dict[str, Dict[str, int]]  # difficulty -> {"n", "correct", "score"}
+
+
+def score_mcq_batch(selected, correct, level, time_left, difficulty=None,
+                    weights: Dict[str, float] = MCQ_DIFFICULTY_WEIGHTS) -> BatchScore:
+    """
+    score_mcq over whole arrays: same points, item for item. `level` and
+    `time_left` may be scalars or per-item; unanswered items are None or < 0
+    in `selected`, and a None time_left counts as 0. The breakdown groups by
+    `difficulty` (e.g. the MCQ's easy/intermediate/advanced tag) when given,
+    else by level. Pass other `weights` to re-score a history under tuned ones.
+    """
+    sel = np.asarray(selected, dtype=np.float64)
+    n = sel.shape[0]
+    answered = ~np.isnan(sel) & (sel >= 0)
+    right = answered & (sel == np.asarray(correct, dtype=np.float64))
+
+    levels = np.broadcast_to(_labels(level), (n,))
+    mult = np.ones(n)
+    for name, w in weights.items():
+        mult[levels == name] = w
+
+    left = np.nan_to_num(np.broadcast_to(np.asarray(time_left, dtype=np.float64), (n,)))
+    bonus = np.trunc(left / 10)
+    # Same float operations as score_mcq, so truncation lands on the same integers
+    scores = np.where(answered, np.trunc(np.where(right, 5, -1) * mult + np.where(right, bonus, 0)), -1)
+    scores = scores.astype(np.int64)
+
+    groups = levels if difficulty is None else np.broadcast_to(_labels(difficulty), (n,))
+    keys, g = np.unique(groups, return_inverse=True)
+    counts = np.bincount(g, minlength=len(keys))
+    n_right = np.bincount(g, weights=right, minlength=len(keys))
+    sums = np.bincount(g, weights=scores, minlength=len(keys))
+    by_difficulty = {
+        k: {"n": int(c), "correct": int(r), "score": int(s)}
+        for k, c, r, s in zip(keys.tolist(), counts, n_right, sums)
+    }
+    return BatchScore(scores, int(scores.sum()), by_difficulty)
@@ -0,0 +1,83 @@
+import re
+from typing import Dict, Iterable, List, Optional
+from config.roles import SKILL_KEYWORDS, SKILL_ALIASES
+
+# A skill must not be glued to other word characters ("python" in "pythonic")
+# but may touch punctuation ("python,", "(docker)", "node.js").
+_BEFORE = r"(?<![\w+#])"
+_AFTER = r"(?![\w+#])"
+
+
+def _normalize(phrase: str) -> str:
+    return " ".join(phrase.lower().split())
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """
+    Compile phrases into a character trie and emit it as one regex, so shared
+    prefixes are tested once instead of once per alternative.
+    """
+    trie: Dict = {}
+    for p in phrases:
+        node = trie
+        for ch in p:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: Dict) -> str:
+        alts = [(r"\s+" if ch == " " else re.escape(ch)) + emit(child)
+                for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class SkillMatcher:
+    """
+    Finds taxonomy skills (and their aliases) in free text in a single regex
+    pass. Multi-word skills match across any whitespace.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self._canonical: Dict[str, str] = {}
+        for s in skills:
+            self._canonical[_normalize(s)] = s
+        for alias, skill in (aliases or {}).items():
+            self._canonical.setdefault(_normalize(alias), skill)
+        body = _trie_regex(self._canonical) if self._canonical else "(?!)"
+        self._pattern = re.compile(_BEFORE + "(" + body + ")" + _AFTER, re.IGNORECASE)
+        # The scan keeps only the longest match, so "rest api" would hide "api":
+        # note the other skills each phrase spells out as whole words.
+        self._inner: Dict[str, frozenset] = {p: self._words_within(p) for p in self._canonical}
+
+    def _words_within(self, phrase: str) -> frozenset:
+        inner = set()
+        for q, skill in self._canonical.items():
+            if q != phrase and re.search(r"(?<!\S)" + re.escape(q) + r"(?!\S)", phrase):
+                inner.add(skill)
+        inner.discard(self._canonical[phrase])
+        return frozenset(inner)
+
+    def lookup(self, phrase: str) -> Optional[str]:
+        """Canonical skill for an exact phrase (skill or alias), else None."""
+        return self._canonical.get(_normalize(phrase))
+
+    def find(self, text: str) -> List[str]:
+        """Sorted, de-duplicated canonical skills mentioned in `text`."""
+        found = set()
+        for m in self._pattern.finditer(text or ""):
+            phrase = _normalize(m.group(1))
+            found.add(self._canonical[phrase])
+            found.update(self._inner[phrase])
+        return sorted(found)
+
+    def remove(self, text: str) -> str:
+        """`text` with every skill mention blanked out."""
+        return self._pattern.sub(" ", text or "")
+
+
+# Built once at import and shared by resume and JD skill extraction.
+SKILL_MATCHER = SkillMatcher(SKILL_KEYWORDS, SKILL_ALIASES)
@@ -1,8 +1,50 @@
+import threading
 import time
+from typing import Dict, Iterator, List
 import streamlit as st
-from modules.mcq_generator import generate_mcqs
-from modules.mcq_ai_generator import generate_ai_mcqs
+from config.runtime import ADAPTIVE_PRACTICE
+from modules.mcq_generator import generate_mcqs, generate_mcq_pool
+from modules.mcq_ai_generator import stream_ai_mcqs
 from modules.dedup import deduplicate_mcq_list
+from modules.attempt_log import record_attempts
+from modules.scoring import score_mcq_batch
+from modules.adaptive import AdaptiveSession
+from modules.question_bank import get_question_bank
+
+
+class MCQFeed:
+    """
+    Drains an MCQ iterator on a background thread into `items`, so a
+    practice session can start on the first question while the rest
+    are still being generated.
+    """
+
+    def __init__(self, source: Iterator[Dict]):
+        self.items: List[Dict] = []
+        self.done = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(source,), name="practice-mcqs", daemon=True)
+        self._thread.start()
+
+    def _run(self, source: Iterator[Dict]):
+        try:
+            for m in source:
+                if self._stop.is_set():
+                    break
+                self.items.append(m)
+        except Exception:
+            pass
+        finally:
+            self.done.set()
+
+    def wait_for(self, n: int) -> bool:
+        """Block until at least n items exist or the source is exhausted."""
+        while len(self.items) < n and not self.done.wait(0.1):
+            pass
+        return len(self.items) >= n
+
+    def stop(self):
+        self._stop.set()
 
 
 def init_practice_state():
@@ -13,12 +55,20 @@ def init_practice_state():
     ss.setdefault("practice_per_q", 60)
     ss.setdefault("practice_results", [])
     ss.setdefault("practice_total_mcqs", 40)
+    ss.setdefault("practice_feed", None)
+    ss.setdefault("practice_engine", None)  # AdaptiveSession while adaptive practice runs
+    ss.setdefault("practice_source", [])  # MCQs the adaptive engine picks from
 
 
 def render_practice_block(ss, DIFFICULTY_SETTINGS, score_fn, use_ai=False):
     st.subheader("Practice Mode ⏱️ (30–60 MCQs)")
 
-    ss.practice_total_mcqs = st.slider("How many questions?", 30, 60, 40, step=5)
+    adaptive = st.toggle(
+        "Adaptive", value=ADAPTIVE_PRACTICE, key="practice_adaptive",
+        help="Pick each question to match how you are doing, and finish early once your level is clear.",
+    )
+    ss.practice_total_mcqs = st.slider("How many questions?" if not adaptive else "At most how many questions?",
+                                       30, 60, 40, step=5)
     per_q = st.slider("Seconds per question", 20, 180, DIFFICULTY_SETTINGS[ss.level]["time_limit"])
 
     colA, colB = st.columns(2)
@@ -29,62 +79,142 @@ def render_practice_block(ss, DIFFICULTY_SETTINGS, score_fn, use_ai=False):
             ss.practice_per_q = per_q
             ss.practice_idx = 0
             ss.practice_results = []
+            if ss.practice_feed is not None:
+                ss.practice_feed.stop()
+                ss.practice_feed = None
 
-            # ✅ AI or fallback
+            ss.practice_engine = AdaptiveSession(ss.level, ss.practice_total_mcqs) if adaptive else None
+
+            # ✅ AI: start on question 1 while the rest keep generating (deduped as they arrive)
             if use_ai:
-                ss.mcqs = generate_ai_mcqs(ss.role, ss.skills, ss.practice_total_mcqs, ss.level)
+                ss.practice_feed = MCQFeed(
+                    stream_ai_mcqs(ss.role, ss.skills, ss.practice_total_mcqs, ss.level, user=ss.get("user_id"))
+                )
+                ss.practice_source = ss.practice_feed.items
+                with st.spinner("Generating the first question..."):
+                    ss.practice_feed.wait_for(1)
+            elif adaptive:
+                # Every difficulty on hand; only the questions actually served are marked seen
+                ss.practice_source = generate_mcq_pool(ss.role, ss.skills, ss.practice_total_mcqs, user=ss.get("user_id"))
             else:
-                ss.mcqs = generate_mcqs(ss.role, ss.skills, ss.practice_total_mcqs, ss.level)
+                ss.practice_source = generate_mcqs(ss.role, ss.skills, ss.practice_total_mcqs, ss.level, user=ss.get("user_id"))
+                # ✅ Dedup practice mode questions
+                ss.practice_source = deduplicate_mcq_list(ss.practice_source)
 
-            # ✅ Dedup practice mode questions
-            ss.mcqs = deduplicate_mcq_list(ss.mcqs)
+            # Adaptive: questions are moved over one at a time as they are picked
+            ss.mcqs = [] if adaptive else ss.practice_source
 
             ss.practice_deadline = time.time() + ss.practice_per_q
 
     with colB:
         if ss.practice_active and st.button("Stop"):
             ss.practice_active = False
+            if ss.practice_feed is not None:
+                ss.practice_feed.stop()
+
+    if ss.practice_active:
+        # ✅ Only the question reruns, once a second while the clock runs
+        st.fragment(_render_practice_question, run_every=1)(ss, score_fn)
+    elif ss.practice_results:
+        res = ss.practice_results
+        scored = score_mcq_batch(
+            [r["selected"] for r in res], [r["correct"] for r in res], [r.get("level", ss.level) for r in res],
+            [r["time_left"] for r in res], difficulty=[r.get("difficulty") or "untagged" for r in res],
+        )
+        st.success(f"Total Score: {scored.total}")
+        st.caption(" · ".join(
+            f"{d}: {b['correct']}/{b['n']} correct, {b['score']} pts" for d, b in scored.by_difficulty.items()
+        ))
+        engine = ss.practice_engine
+        if engine is not None and engine.ability.n == len(res):
+            st.info(f"{_end_reason(ss, engine, len(res))} Ability estimate: θ ≈ {engine.ability.theta:+.2f} "
+                    f"± {engine.ability.se:.2f} (0 = intermediate, -1 = easy, +1 = advanced).")
+
+
+def _end_reason(ss, engine, answered: int) -> str:
+    """Why an adaptive session ended, for the summary."""
+    feed = ss.practice_feed
+    if engine.converged:
+        return f"Finished after {answered} questions: your level was clear."
+    if engine.served >= engine.max_items:
+        return f"Reached the maximum of {engine.max_items} questions before the estimate settled."
+    if ss.practice_idx < len(ss.mcqs) or len(engine.pool) or (feed is not None and not feed.done.is_set()):
+        return f"Stopped after {answered} questions."
+    return (f"Ran out of questions after {answered} of at most {engine.max_items}, before the estimate "
+            "settled; add more to the question bank for a tighter estimate.")
+
+
+def _record_answer(ss, score_fn, time_left: int):
+    m = ss.mcqs[ss.practice_idx]
+    choice = ss.get(f"practice_{ss.practice_idx}", m["options"][0])
+    selected_idx = m["options"].index(choice)
+    gained = score_fn(selected_idx, m["answer_index"], ss.level, time_left)
+
+    ss.practice_results.append({
+        "selected": selected_idx,
+        "correct": m["answer_index"],
+        "score": gained,
+        "time_left": time_left,
+        "difficulty": m.get("difficulty", ""),
+        "level": ss.level,
+    })
+
+    record_attempts(ss.get("user_id", ""), "practice", [{
+        "id": m.get("id"), "skill": m.get("skill"), "difficulty": m.get("difficulty"),
+        "is_correct": selected_idx == m["answer_index"], "score": gained, "time_left": time_left,
+    }], level=ss.level)
+    if ss.practice_engine is not None:
+        ss.practice_engine.record(m, gained, time_left, ss.practice_per_q)
+
+    ss.practice_idx += 1
+    ss.practice_deadline = time.time() + ss.practice_per_q
+
+
+def _submit_answer(ss, score_fn):
+    if ss.practice_active and ss.practice_idx < len(ss.mcqs):
+        _record_answer(ss, score_fn, max(0, int(ss.practice_deadline - time.time())))
+
+
+def _render_practice_question(ss, score_fn):
+    feed = ss.practice_feed
+    if ss.practice_idx < len(ss.mcqs) and time.time() >= ss.practice_deadline:
+        _record_answer(ss, score_fn, 0)
+
+    engine = ss.practice_engine
+    if engine is not None and ss.practice_idx >= len(ss.mcqs):
+        # ✅ Adaptive: pick the next question for the current estimate (a bisect into the pool)
+        engine.ingest(ss.practice_source)
+        m = engine.next_item()
+        if m is not None:
+            ss.mcqs.append(m)
+            if m.get("id") is not None and ss.get("user_id"):
+                get_question_bank().mark_seen(ss.user_id, [m["id"]])
+            ss.practice_deadline = time.time() + ss.practice_per_q
+        elif engine.finished and feed is not None:
+            feed.stop()  # converged early: no need to generate the rest
 
-    if not ss.practice_active:
+    waiting = engine is None or not engine.finished
+    if ss.practice_idx >= len(ss.mcqs) and waiting and feed is not None and not feed.done.is_set():
+        # ✅ Caught up with generation: keep the clock parked until the next question lands
+        ss.practice_deadline = time.time() + ss.practice_per_q
+        st.info("Generating the next question...")
         return
 
     if ss.practice_idx >= len(ss.mcqs):
+        # Finished: a full rerun stops the ticking and shows the total
         ss.practice_active = False
-        total = sum(r["score"] for r in ss.practice_results)
-        st.success(f"Total Score: {total}")
-        return
+        st.rerun()
 
     m = ss.mcqs[ss.practice_idx]
     st.markdown(f"### Q{ss.practice_idx+1}: {m['question']}")
-    choice = st.radio("Choose one:", m["options"], key=f"practice_{ss.practice_idx}")
+    if engine is not None:
+        st.caption(f"Question {ss.practice_idx + 1} of at most {engine.max_items} · "
+                   f"ability θ ≈ {engine.ability.theta:+.2f} ± {engine.ability.se:.2f}")
+    elif feed is not None and not feed.done.is_set():
+        st.caption(f"{len(ss.mcqs)} of {ss.practice_total_mcqs} questions ready, more on the way...")
+    st.radio("Choose one:", m["options"], key=f"practice_{ss.practice_idx}")
 
     time_left = max(0, int(ss.practice_deadline - time.time()))
     st.progress(1 - (time_left / ss.practice_per_q), text=f"Time left: {time_left}s")
 
-    if st.button("Submit & Next"):
-        selected_idx = m["options"].index(choice)
-        gained = score_fn(selected_idx, m["answer_index"], ss.level, time_left)
-
-        ss.practice_results.append({
-            "selected": selected_idx,
-            "correct": m["answer_index"],
-            "score": gained,
-            "time_left": time_left,
-        })
-
-        ss.practice_idx += 1
-        ss.practice_deadline = time.time() + ss.practice_per_q
-        st.rerun()
-
-    if time_left == 0:
-        selected_idx = m["options"].index(choice)
-        gained = score_fn(selected_idx, m["answer_index"], ss.level, time_left)
-        ss.practice_results.append({
-            "selected": selected_idx,
-            "correct": m["answer_index"],
-            "score": gained,
-            "time_left": 0,
-        })
-        ss.practice_idx += 1
-        ss.practice_deadline = time.time() + ss.practice_per_q
-        st.rerun()
+    st.button("Submit & Next", on_click=_submit_answer, args=(ss, score_fn))
@@ -1,11 +1,14 @@
 import random
 import streamlit as st
-import speech_recognition as sr
 from io import BytesIO
-from st_audiorec import st_audiorec
-from modules.llm import generate_text
+from modules.lazy import lazy_import
+from modules.llm import generate_text, stream_text
 from modules.question_generator import simple_hr_questions
 
+sr = lazy_import("speech_recognition")
+audiorec = lazy_import("st_audiorec")
+
+@st.fragment
 def render_voice_interview(ss):
     """
     Renders the Voice Interview tab with live microphone support.
@@ -37,7 +40,7 @@ def render_voice_interview(ss):
     st.write("### 🎙️ Record Your Answer")
     
     # Live Audio Recording
-    wav_audio_data = st_audiorec()
+    wav_audio_data = audiorec.st_audiorec()
 
     if wav_audio_data is not None:
         st.success("Audio recorded successfully!")
@@ -50,9 +53,14 @@ def render_voice_interview(ss):
                 ss.vi_transcript = text
                 st.write(f"**📝 Transcript:** {text}")
                 
-                # Generate Feedback
-                with st.spinner("Analyzing answer..."):
-                    ss.vi_last_feedback = generate_feedback(ss.vi_question, text)
+                # Generate Feedback (streamed so the user sees it being written)
+                placeholder = st.empty()
+                response = ""
+                for piece in stream_feedback(ss.vi_question, text):
+                    response += piece
+                    placeholder.markdown(response)
+                placeholder.empty()
+                ss.vi_last_feedback = parse_feedback(response)
             else:
                 st.error("Could not understand audio. Please try speaking clearer or closer to the mic.")
 
@@ -99,10 +107,7 @@ def transcribe_audio(wav_data):
         return None
 
 
-def generate_feedback(question, answer):
-    """
-    Generates structured feedback using the LLM.
-    """
+def _feedback_prompt(question, answer):
     prompt = f"""
     You are an expert technical interviewer. Evaluate the candidate's answer.
     
@@ -120,8 +125,25 @@ def generate_feedback(question, answer):
     Output strictly in this format.
     """
     
-    response = generate_text(prompt, max_tokens=300)
-    
+    return prompt
+
+
+def generate_feedback(question, answer):
+    """
+    Generates structured feedback using the LLM.
+    """
+    response = generate_text(_feedback_prompt(question, answer), max_tokens=300)
+    return parse_feedback(response)
+
+
+def stream_feedback(question, answer):
+    """
+    Yields the raw LLM feedback as it is decoded; pass the joined text to parse_feedback.
+    """
+    return stream_text(_feedback_prompt(question, answer), max_tokens=300)
+
+
+def parse_feedback(response):
     # Simple parsing (robustness can be improved)
     feedback_dict = {}
     lines = response.split('\n')
@@ -0,0 +1,114 @@
+import pytest
+
+from modules.adaptive import (
+    AbilityEstimate, AdaptiveSession, ItemPool, LEVEL_THETA, answer_outcome, item_difficulty,
+)
+
+
+def _item(name, difficulty="intermediate", **kw):
+    return {"question": name, "difficulty": difficulty, **kw}
+
+
+def test_item_difficulty():
+    assert item_difficulty(_item("q", "easy")) == -1.0
+    assert item_difficulty(_item("q", "advanced")) == 1.0
+    assert item_difficulty(_item("q", "unknown")) == 0.0
+    assert item_difficulty(_item("q", "easy", rating=0.4)) == 0.4
+
+
+def test_answer_outcome():
+    assert answer_outcome(-1, 30, 60) == 0.0
+    assert answer_outcome(0, 30, 60) == 0.0
+    assert answer_outcome(5, 60, 60, speed_weight=0.2) == 1.0
+    assert answer_outcome(5, 0, 60, speed_weight=0.2) == pytest.approx(0.8)
+    assert answer_outcome(5, 30, 60, speed_weight=0.2) == pytest.approx(0.9)
+    assert answer_outcome(5, 90, 60, speed_weight=0.2) == 1.0
+    assert answer_outcome(5, 0, 0, speed_weight=0.2) == 1.0
+
+
+def test_ability_update_is_a_newton_step():
+    a = AbilityEstimate(0.0)
+    a.update(0.0, 1.0)  # p = 0.5: info 1 + 0.25, step 0.5 / 1.25
+    assert a.theta == pytest.approx(0.4)
+    assert a.se == pytest.approx(1 / 1.25 ** 0.5)
+    assert a.n == 1
+
+    b = AbilityEstimate(0.0)
+    b.update(0.0, 0.0)
+    assert b.theta == pytest.approx(-0.4)
+
+
+def test_ability_moves_with_answers_and_gets_more_precise():
+    a = AbilityEstimate(0.0)
+    ses = [a.se]
+    for _ in range(200):
+        a.update(2.0, 1.0)
+        ses.append(a.se)
+    assert a.theta == 3.0  # clamped
+    assert all(later < earlier for earlier, later in zip(ses, ses[1:]))
+
+    for _ in range(200):
+        a.update(-2.0, 0.0)
+    assert a.theta < 0
+
+
+def test_pool_pops_nearest_difficulty():
+    pool = ItemPool()
+    for m in [_item("e1", "easy"), _item("a1", "advanced"), _item("e2", "easy"), _item("r", rating=0.4)]:
+        pool.add(m)
+    assert len(pool) == 4
+    assert pool.pop_nearest(0.3)["question"] == "r"
+    assert pool.pop_nearest(-5)["question"] == "e1"  # FIFO within a difficulty
+    assert pool.pop_nearest(0.0)["question"] == "e2"  # tie between -1 and 1 goes to the easier
+    assert pool.pop_nearest(-5)["question"] == "a1"
+    assert len(pool) == 0
+    assert pool.pop_nearest(0.0) is None
+
+
+def test_session_ingests_only_new_items():
+    s = AdaptiveSession("Intermediate", max_items=10)
+    source = [_item("q1"), _item("q2")]
+    s.ingest(source)
+    s.ingest(source)
+    assert len(s.pool) == 2
+    source.append(_item("q3"))
+    s.ingest(source)
+    assert len(s.pool) == 3
+
+
+def test_session_follows_the_ability_estimate():
+    s = AdaptiveSession("Beginner", max_items=40, min_items=100)
+    assert s.ability.theta == LEVEL_THETA["Beginner"]
+    s.ingest([_item(f"{d}{i}", d) for d in ("easy", "intermediate", "advanced") for i in range(10)])
+
+    first = s.next_item()
+    assert first["difficulty"] == "easy"
+    served = [first]
+    for _ in range(6):
+        s.record(served[-1], points=5, time_left=60, time_limit=60)
+        served.append(s.next_item())
+    assert served[-1]["difficulty"] == "advanced"
+    assert s.served == 7
+
+
+def test_session_stops_at_max_items():
+    s = AdaptiveSession("Intermediate", max_items=3, min_items=100)
+    s.ingest([_item(f"q{i}") for i in range(10)])
+    served = [s.next_item() for _ in range(3)]
+    assert all(served) and s.finished and not s.converged
+    assert s.next_item() is None
+    assert len(s.pool) == 7
+
+
+def test_session_converges():
+    s = AdaptiveSession("Intermediate", max_items=100, min_items=5, target_se=0.5)
+    s.ingest([_item(f"q{i}", rating=0.0) for i in range(100)])
+    answers = 0
+    while not s.finished:
+        m = s.next_item()
+        s.record(m, points=5 if answers % 2 else -1, time_left=60, time_limit=60)
+        answers += 1
+    assert s.converged
+    assert s.ability.se <= 0.5
+    assert 5 <= answers < 100
+    assert abs(s.ability.theta) < 0.5
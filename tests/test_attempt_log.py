@@ -0,0 +1,102 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from config import runtime
+from modules import attempt_log, mcq_generator, pregen
+from modules.attempt_log import AttemptLog
+from modules.question_bank import QuestionBank
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def _rows():
+    return [
+        {"id": 1, "skill": "Python", "difficulty": "easy", "is_correct": True, "score": 5, "time_left": 42},
+        {"id": 2, "skill": "python", "difficulty": "easy", "is_correct": False, "score": -1, "time_left": 3},
+        {"id": 3, "skill": "sql", "difficulty": "advanced", "is_correct": True, "score": 10, "time_left": 47},
+        {"id": 4, "skill": "", "difficulty": "intermediate", "is_correct": True, "score": 7},
+    ]
+
+
+@pytest.fixture
+def log(tmp_path):
+    return AttemptLog(str(tmp_path / "attempts.sqlite3"))
+
+
+def test_record_updates_every_summary(log):
+    assert log.record("u1", "practice", _rows(), level="Beginner") == 4
+    assert log.record("u2", "check", _rows()[:1]) == 1
+    assert log.record("u1", "check", []) == 0
+
+    assert len(log) == 5
+    assert log.accuracy_by_cell("practice") == [
+        {"skill": "python", "difficulty": "easy", "attempts": 2, "accuracy": 50.0, "avg_score": 2.0},
+        {"skill": "general", "difficulty": "intermediate", "attempts": 1, "accuracy": 100.0, "avg_score": 7.0},
+        {"skill": "sql", "difficulty": "advanced", "attempts": 1, "accuracy": 100.0, "avg_score": 10.0},
+    ]
+    assert log.accuracy_by_cell()[0] == {"skill": "python", "difficulty": "easy", "attempts": 3,
+                                         "accuracy": 66.7, "avg_score": 3.0}
+    assert log.time_left_histogram() == [
+        {"time_left_s": 0, "answers": 1, "accuracy": 0.0},
+        {"time_left_s": 40, "answers": 2, "accuracy": 100.0},
+    ]
+    assert log.totals() == {"attempts": 5, "accuracy": 80.0, "users": 2}
+    assert log.totals("u1") == {"attempts": 4, "accuracy": 75.0, "users": 1}
+    assert log.totals("nobody") == {"attempts": 0, "accuracy": 0.0, "users": 0}
+    [today] = log.user_trend("u1")
+    assert (today["attempts"], today["accuracy"], today["score"]) == (4, 75.0, 21)
+
+
+def test_summaries_survive_reopening(tmp_path):
+    path = str(tmp_path / "attempts.sqlite3")
+    AttemptLog(path).record("u1", "check", _rows())
+    assert AttemptLog(path).totals() == {"attempts": 4, "accuracy": 75.0, "users": 1}
+
+
+def test_rescore(log):
+    log.record("u1", "practice", _rows(), level="Advanced")
+    log.record("u1", "check", _rows(), level="Advanced")  # not practice: not rescored
+
+    out = log.rescore({"Advanced": 1.0})
+    assert out == {
+        "easy": {"n": 2, "correct": 1, "score": 8, "logged_score": 4},
+        "advanced": {"n": 1, "correct": 1, "score": 9, "logged_score": 10},
+        "intermediate": {"n": 1, "correct": 1, "score": 5, "logged_score": 7},
+    }
+    assert {d: b["score"] for d, b in log.rescore({"Advanced": 2.0}).items()} == {
+        "easy": 12, "advanced": 14, "intermediate": 10}
+
+
+def test_rechecking_mcqs_logs_each_question_once(tmp_path, monkeypatch):
+    log = AttemptLog(str(tmp_path / "attempts.sqlite3"))
+    bank = QuestionBank(str(tmp_path / "bank.sqlite3"))
+    monkeypatch.setattr(attempt_log, "get_attempt_log", lambda: log)
+    monkeypatch.setattr(mcq_generator, "get_question_bank", lambda: bank)
+    monkeypatch.setattr(runtime, "PRELOAD_ENABLED", False)
+    monkeypatch.setattr(pregen, "PREGEN_ENABLED", False)
+
+    at = AppTest.from_file(APP, default_timeout=30).run()
+    next(t for t in at.toggle if t.label.startswith("Use AI")).set_value(False).run()
+    next(b for b in at.button if b.label == "Generate MCQs").click().run()
+    n = len(at.session_state.mcqs)
+    radios = [r for r in at.radio if r.key and r.key.startswith("mcq_")]
+    radios[0].set_value(radios[0].options[0])
+    radios[1].set_value(radios[1].options[1])
+    check = next(b for b in at.button if b.label == "Check page 1")
+    check.click().run()
+    assert n and not at.exception
+    assert len(log) == 2
+    before = (log.totals(), log.accuracy_by_cell())
+
+    next(b for b in at.button if b.label == "Check page 1").click().run()
+    radios = [r for r in at.radio if r.key and r.key.startswith("mcq_")]
+    radios[0].set_value(radios[0].options[2])
+    next(b for b in at.button if b.label == "Check page 1").click().run()
+    assert (log.totals(), log.accuracy_by_cell()) == before
+
+    radios = [r for r in at.radio if r.key and r.key.startswith("mcq_")]
+    radios[2].set_value(radios[2].options[0])
+    next(b for b in at.button if b.label == "Check page 1").click().run()
+    assert len(log) == 3
@@ -0,0 +1,70 @@
+import pytest
+
+from modules.dedup import MinHashLSH, deduplicate_mcq_list, deduplicate_text_list, shingles
+
+PARAPHRASES = [
+    ("Describe a time you failed.", "Describe a time when you failed?"),
+    ("What is a Python decorator?", "What is a decorator in Python?"),
+    ("Explain Python decorators.", "Explain decorators in Python"),
+    ("Tell me about a conflict with a coworker.", "Tell me about a conflict you had with a coworker."),
+    ("Explain indexing in SQL (Basics)", "Explain indexing in SQL (Depth)"),
+    ("Describe a project where you used Python.", "Describe a project in which you used Python?"),
+]
+
+DISTINCT = [
+    ("Explain the difference between list and tuple", "Explain the difference between tuple and set"),
+    ("What is a Python list?", "What is a Python tuple?"),
+    ("Describe a time you failed.", "Describe a time you succeeded."),
+    ("Explain indexing in python", "Explain indexing in sql"),
+    ("Why use indexes in SQL?", "When should you not use indexes in SQL?"),
+    ("What is Docker?", "Why Docker?"),
+    ("How do you handle stress?", "Why do you handle stress?"),
+    ("When would you use a tuple instead of a list in Python?",
+     "Why would you use a list instead of a tuple in Python?"),
+    ("Why use indexes?", "Why don't you use indexes?"),
+]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("first,second", PARAPHRASES)
+def test_paraphrases_are_near_duplicates(first, second, seed):
+    index = MinHashLSH(seed=seed)
+    assert index.add_if_new(0, first)
+    assert not index.add_if_new(1, second)
+
+
+@pytest.mark.parametrize("first,second", DISTINCT)
+def test_different_questions_are_kept(first, second):
+    index = MinHashLSH()
+    assert index.add_if_new(0, first)
+    assert index.add_if_new(1, second)
+
+
+def test_deduplicate_text_list_near():
+    items = [a for a, _ in PARAPHRASES] + [b for _, b in PARAPHRASES]
+    assert deduplicate_text_list(items, near=True) == [a for a, _ in PARAPHRASES]
+    assert len(deduplicate_text_list(items)) == len(items)
+
+
+def test_shingles():
+    assert shingles("Why don't you use indexes?") == shingles("why do not you use indexes")
+    assert shingles("Describe a time you failed.") == shingles("Describe a time when you failed?")
+    assert shingles("Why use indexes?") != shingles("How use indexes?")
+    assert shingles("What is a Python decorator?") != shingles("What is a decorator in Python?")
+    assert (shingles("What is a Python decorator?", skills=False)
+            == shingles("What is a decorator in Python?", skills=False))
+    assert shingles("") == set()
+
+
+def test_without_topic_skills_still_tell_questions_apart():
+    index = MinHashLSH(topic=None)
+    assert index.add_if_new(0, "Explain indexing in python")
+    assert index.add_if_new(1, "Explain indexing in sql")
+    assert not index.add_if_new(2, "Explain indexing in python (Basics)")
+
+
+def test_deduplicate_mcq_list_near():
+    mcqs = [{"question": a, "options": []} for a, _ in PARAPHRASES]
+    mcqs += [{"question": b, "options": []} for _, b in PARAPHRASES] + [{"options": []}, "not an mcq"]
+    assert deduplicate_mcq_list(mcqs, near=True) == mcqs[:len(PARAPHRASES)]
+    assert len(deduplicate_mcq_list(mcqs)) == 2 * len(PARAPHRASES)
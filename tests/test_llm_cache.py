@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from modules import jd_analyzer, llm, model_client
+from modules.llm_cache import CompletionCache
+
+
+class _FakeBatcher:
+    def __init__(self):
+        self.prompts = []
+
+    def submit(self, prompts, params, deadline=None, max_items=None):
+        self.prompts.extend(prompts)
+        return [(f"completion {len(self.prompts) - len(prompts) + i}", False) for i in range(len(prompts))]
+
+
+@pytest.fixture
+def batcher(tmp_path, monkeypatch):
+    fake = _FakeBatcher()
+    cache = CompletionCache(str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setattr(model_client, "remote_enabled", lambda: False)
+    monkeypatch.setattr(llm, "load_llm", lambda: ("tokenizer", "model"))
+    monkeypatch.setattr(llm, "get_cache", lambda: cache)
+    monkeypatch.setattr(llm, "get_batcher", lambda: fake)
+    return fake
+
+
+def test_sampled_calls_hit_the_cache_by_default(batcher):
+    random.seed(0)
+    texts = [llm.generate_text("Generate 5 HR questions", temperature=0.8) for _ in range(40)]
+    assert len(batcher.prompts) <= llm.LLM_CACHE_SAMPLE_SLOTS
+    assert 1 < len(set(texts)) <= llm.LLM_CACHE_SAMPLE_SLOTS
+
+
+def test_deterministic_calls_replay_one_completion(batcher):
+    first = llm.generate_text("Summarize", deterministic=True)
+    assert llm.generate_text("Summarize", deterministic=True) == first
+    assert len(batcher.prompts) == 1
+
+
+def test_jd_summary_is_cached(batcher):
+    jd = "We need a Python developer with SQL and Docker experience."
+    jd_analyzer.jd_summary(jd, chunks=[jd])
+    jd_analyzer.jd_summary(jd, chunks=[jd])
+    assert len(batcher.prompts) == 1
+
+
+def test_use_cache_false_always_generates(batcher):
+    for _ in range(3):
+        llm.generate_text("Generate 5 HR questions", use_cache=False)
+    assert len(batcher.prompts) == 3
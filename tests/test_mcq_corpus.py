@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from modules.mcq_corpus import MCQCorpus, _shard_path, _write_shard, build, valid_mcq, write_corpus
+
+
+def _mcq(q, difficulty="easy", answer=0, explanation="why"):
+    return {"question": q, "options": [f"{q} a", f"{q} b", f"{q} c", f"{q} d"], "answer_index": answer,
+            "explanation": explanation, "difficulty": difficulty}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "corpus.bin")
+    cells = {
+        ("python", "easy"): [_mcq("What does len() return?"), _mcq("Ünïcödé — question?", answer=3, explanation="")],
+        ("sql", "advanced"): [_mcq("What is a covering index?", "advanced", answer=2)],
+        ("empty", "easy"): [],
+    }
+    write_corpus(path, cells, model="test-model")
+
+    corpus = MCQCorpus(path)
+    assert corpus.model == "test-model"
+    assert len(corpus) == 3
+    assert corpus.cells.keys() == {("python", "easy"), ("sql", "advanced")}
+    assert corpus.count("Python", "easy") == 2
+    assert corpus.count("python", "advanced") == 0
+
+    got = sorted(corpus.sample("PYTHON", "easy", 5, rng=random.Random(0)), key=lambda m: m["question"])
+    want = sorted(({**m, "skill": "python"} for m in cells[("python", "easy")]), key=lambda m: m["question"])
+    assert got == want
+    assert corpus.sample("sql", "advanced", 1) == [{**cells[("sql", "advanced")][0], "skill": "sql"}]
+    assert corpus.sample("sql", "easy", 3) == []
+    assert corpus.sample("python", "easy", 0) == []
+
+
+def test_sample_is_distinct(tmp_path):
+    path = str(tmp_path / "corpus.bin")
+    write_corpus(path, {("python", "easy"): [_mcq(f"Question number {i}?") for i in range(50)]})
+    got = MCQCorpus(path).sample("python", "easy", 20)
+    assert len({m["question"] for m in got}) == 20
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "corpus.bin"
+    path.write_bytes(b"NOPE" + bytes(64))
+    with pytest.raises(ValueError):
+        MCQCorpus(str(path))
+
+
+def test_valid_mcq():
+    assert valid_mcq(_mcq("What does len() return?"))
+    assert not valid_mcq(_mcq("Short?"))
+    assert not valid_mcq(_mcq("What does len() return?", difficulty="hard"))
+    assert not valid_mcq({**_mcq("What does len() return?"), "options": ["a", "A", "b", "c"]})
+    assert not valid_mcq({**_mcq("What does len() return?"), "options": ["a", "b", "c"]})
+    assert not valid_mcq({**_mcq("What does len() return?"), "answer_index": 4})
+
+
+def test_build_from_shards(tmp_path):
+    shards = str(tmp_path / "shards")
+    _write_shard(_shard_path(shards, "python"), [
+        _mcq("What is a Python list?"), _mcq("What is a Python list?"), _mcq("What is a generator?", "advanced"),
+    ])
+    _write_shard(_shard_path(shards, "django"), [_mcq("what is a python list?"), _mcq("What is a Django view?")])
+    out = str(tmp_path / "corpus.bin")
+
+    # Every skill already has a shard, so nothing is generated
+    sizes = build(out, ["django", "python"], per_cell=5, workers=1, shard_dir=shards)
+
+    assert sizes == {"django/easy": 2, "python/advanced": 1}
+    corpus = MCQCorpus(out)
+    assert {m["question"] for m in corpus.sample("django", "easy", 5)} == {
+        "what is a python list?", "What is a Django view?"}
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from modules.question_bank import QuestionBank
+
+
+def _items(n, skill="Testing", difficulty="easy"):
+    return [{"skill": skill, "difficulty": difficulty, "question": f"Question number {i}?",
+             "options": ["a", "b", "c", "d"], "answer_index": i % 4, "explanation": f"because {i}"}
+            for i in range(n)]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return QuestionBank(str(tmp_path / "bank.sqlite3"))
+
+
+def test_new_bank_is_seeded(bank):
+    assert len(bank) > 0
+    assert bank.count("python", "easy") > 0
+    assert bank.count("PYTHON") == sum(bank.count("python", d) for d in ("easy", "intermediate", "advanced"))
+
+
+def test_import_skips_invalid_and_duplicate_items(bank):
+    items = _items(5) + [
+        {"skill": "testing", "difficulty": "easy", "question": "  QUESTION   number 0? ",
+         "options": ["a", "b"], "answer_index": 0},  # same question, other spacing/case
+        {"skill": "testing", "difficulty": "easy", "question": "No options", "options": [], "answer_index": 0},
+        {"skill": "testing", "difficulty": "hard", "question": "Bad difficulty?", "options": ["a", "b"],
+         "answer_index": 0},
+        {"skill": "testing", "difficulty": "easy", "question": "Bad answer?", "options": ["a", "b"],
+         "answer_index": 2},
+        {"skill": "", "difficulty": "easy", "question": "No skill?", "options": ["a", "b"], "answer_index": 0},
+    ]
+    assert bank.import_items(items, source="test") == 5
+    assert bank.import_items(_items(7)) == 2
+    assert bank.count("testing", "easy") == 7
+    assert bank.stats()["testing/easy"] == 7
+
+
+@pytest.mark.parametrize("n,k", [(6, 4), (6, 10), (400, 10)])  # scan / scan, short cell / slot sampling
+def test_sample_returns_distinct_items_of_the_cell(bank, n, k):
+    bank.import_items(_items(n))
+    got = bank.sample("Testing", "easy", k, rng=random.Random(0))
+    assert len(got) == min(n, k)
+    assert len({m["id"] for m in got}) == len(got)
+    assert all(m["skill"] == "testing" and m["difficulty"] == "easy" for m in got)
+    m = got[0]
+    assert m["options"] == ["a", "b", "c", "d"]
+    assert m["explanation"] == f"because {m['question'].split()[-1].rstrip('?')}"
+    assert bank.sample("testing", "advanced", k) == []
+    assert bank.sample("testing", "easy", 0) == []
+
+
+@pytest.mark.parametrize("n", [8, 400])
+def test_seen_items_are_skipped_until_reset(bank, n):
+    bank.import_items(_items(n))
+    rng = random.Random(1)
+    served = set()
+    while True:
+        got = bank.sample("testing", "easy", 5, user="u1", rng=rng)
+        if not got:
+            break
+        ids = {m["id"] for m in got}
+        assert not ids & served
+        served |= ids
+        bank.mark_seen("u1", ids)
+    assert len(served) == n
+    assert len(bank.sample("testing", "easy", 5, user="u2")) == 5
+    bank.reset_seen("u1")
+    assert len(bank.sample("testing", "easy", 5, user="u1")) == 5
+
+
+def test_sample_honours_exclude(bank):
+    bank.import_items(_items(8))
+    first = bank.sample("testing", "easy", 6)
+    rest = bank.sample("testing", "easy", 6, exclude=[m["id"] for m in first])
+    assert len(rest) == 2
+    assert not {m["id"] for m in first} & {m["id"] for m in rest}
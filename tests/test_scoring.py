@@ -0,0 +1,45 @@
+import random
+
+from modules.scoring import MCQ_DIFFICULTY_WEIGHTS, score_mcq, score_mcq_batch
+
+
+def _random_answers(n, seed=0):
+    rng = random.Random(seed)
+    levels = list(MCQ_DIFFICULTY_WEIGHTS) + ["Expert", ""]
+    selected = [rng.choice([None, -1, -3, 0, 1, 2, 3]) for _ in range(n)]
+    correct = [rng.randrange(4) for _ in range(n)]
+    level = [rng.choice(levels) for _ in range(n)]
+    time_left = [rng.choice([None, 0, 5, 9, 10, 59, 60, 180, -3, -15, 7.5]) for _ in range(n)]
+    return selected, correct, level, time_left
+
+
+def test_batch_matches_score_mcq():
+    selected, correct, level, time_left = _random_answers(5000)
+    expected = [score_mcq(s, c, lv, t) for s, c, lv, t in zip(selected, correct, level, time_left)]
+
+    scored = score_mcq_batch(selected, correct, level, time_left)
+
+    assert scored.scores.tolist() == expected
+    assert scored.total == sum(expected)
+
+
+def test_batch_scalar_level_and_time_left():
+    selected, correct, _, _ = _random_answers(500, seed=1)
+    for lv in list(MCQ_DIFFICULTY_WEIGHTS) + ["Unknown"]:
+        for t in (None, 0, 33):
+            expected = [score_mcq(s, c, lv, t) for s, c in zip(selected, correct)]
+            assert score_mcq_batch(selected, correct, lv, t).scores.tolist() == expected
+
+
+def test_batch_breakdown_by_difficulty():
+    scored = score_mcq_batch([1, 0, None], [1, 1, 2], "Advanced", [33, None, 10],
+                             difficulty=["easy", "easy", "advanced"])
+    assert scored.by_difficulty == {
+        "advanced": {"n": 1, "correct": 0, "score": -1},
+        "easy": {"n": 2, "correct": 1, "score": 10},
+    }
+
+
+def test_batch_empty():
+    scored = score_mcq_batch([], [], "Beginner", 0)
+    assert scored.total == 0 and scored.scores.tolist() == [] and scored.by_difficulty == {}
@@ -0,0 +1,34 @@
+import pytest
+
+from modules.jd_analyzer import extract_jd_skills
+from modules.skill_matcher import SKILL_MATCHER, SkillMatcher
+
+
+def test_alias_keeps_the_skills_it_contains():
+    text = "Must have: REST API design, Google Cloud, ML pipelines"
+    assert extract_jd_skills(text) == ["api", "cloud", "gcp", "machine learning", "rest"]
+    assert SKILL_MATCHER.find("Google Cloud Platform") == ["cloud", "gcp"]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("python, (docker) and node.js", ["docker", "node", "python"]),
+    ("Python3 and K8S", ["kubernetes", "python"]),
+    ("machine\n   learning", ["machine learning"]),
+    ("pythonic javascript", ["javascript"]),
+    ("", []),
+])
+def test_taxonomy_matches(text, expected):
+    assert SKILL_MATCHER.find(text) == expected
+
+
+def test_symbol_boundaries():
+    m = SkillMatcher(["c", "c++", "c#", "node", "javascript"], {"node.js": "node", "js": "javascript"})
+    assert m.find("C++ and C# developers") == ["c#", "c++"]
+    assert m.find("plain C, not c++") == ["c", "c++"]
+    assert m.find("node.js backend") == ["node"]
+    assert m.find("cpp, csharp, nodejs") == []
+
+
+def test_lookup():
+    assert SKILL_MATCHER.lookup("  Scikit   Learn ") == "scikit-learn"
+    assert SKILL_MATCHER.lookup("cobol") is None